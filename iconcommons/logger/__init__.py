@@ -13,3 +13,4 @@
 # limitations under the License.
 
 from .logger import Logger
+from ._logger import IconLogReader, IconBinaryDecoder, merge_logs, write_merged, process_log_paths
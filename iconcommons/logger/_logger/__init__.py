@@ -13,3 +13,7 @@
 # limitations under the License.
 
 from .icon_logger_util import IconLoggerUtil, icon_logger
+from .icon_log_reader import IconLogReader
+from .icon_log_merger import merge_logs, write_merged, process_log_paths
+from .icon_log_context import LogContext, log_context
+from .icon_binary_log import IconBinaryDecoder
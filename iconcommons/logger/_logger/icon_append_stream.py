@@ -0,0 +1,253 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ctypes
+import ctypes.util
+import os
+import sys
+import threading
+import time
+from typing import List, Optional
+
+from .utils import report_error
+
+FALLOC_FL_KEEP_SIZE = 0x01
+
+
+def _load_fallocate():
+    # posix_fallocate() grows the file size, which puts O_APPEND writes behind the preallocated zeros,
+    # so fallocate(2) with FALLOC_FL_KEEP_SIZE is called instead. It only exists on linux.
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        func = getattr(libc, 'fallocate64', None) or libc.fallocate
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+    func.restype = ctypes.c_int
+    return func
+
+
+_fallocate = _load_fallocate()
+
+
+def _iov_max() -> int:
+    # writev(2) fails with EINVAL for more buffers than this, 1024 on linux
+    try:
+        value = os.sysconf('SC_IOV_MAX')
+    except (AttributeError, ValueError, OSError):
+        return 1024
+    # at least _XOPEN_IOV_MAX where the limit is not known
+    return value if value > 0 else 16
+
+
+IOV_MAX = _iov_max()
+
+
+def preallocate(fd: int, offset: int, length: int) -> bool:
+    """
+    Reserve disk blocks for [offset, offset + length) without changing the file size.
+    """
+    if _fallocate is None or length <= 0:
+        return False
+    return _fallocate(fd, FALLOC_FL_KEEP_SIZE, offset, length) == 0
+
+
+class IconAppendFlusher(object):
+    """
+    Writes the pending records of batching IconAppendStreams once their batch_interval is over,
+    also when no further record comes along to do it.
+    """
+
+    def __init__(self):
+        # stream -> monotonic time it is due
+        self._streams: dict = {}
+        self._cond = threading.Condition(threading.Lock())
+        self._thread: threading.Thread = None
+
+    def schedule(self, stream: 'IconAppendStream', due: float):
+        with self._cond:
+            if stream in self._streams:
+                return
+            self._streams[stream] = due
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="IconAppendFlusher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                due = [stream for stream, at in self._streams.items() if at <= now]
+                if not due:
+                    timeout = min(self._streams.values()) - now if self._streams else None
+                    self._cond.wait(timeout)
+                    continue
+                for stream in due:
+                    del self._streams[stream]
+
+            for stream in due:
+                try:
+                    next_due = stream.flush_due()
+                except Exception:
+                    report_error()
+                    continue
+                if next_due is not None:
+                    self.schedule(stream, next_due)
+
+
+flusher = IconAppendFlusher()
+
+
+class IconAppendStream(object):
+    """
+    File stream for the iconcommons file handlers which writes with os.write on an O_APPEND descriptor.
+
+    Records are encoded once and written without going through TextIOWrapper and BufferedWriter.
+    Every write lands at the end of the file in one system call, so lines of
+    processes sharing the file do not interleave.
+    With `batch_records` > 1 records are kept until that many are pending or the oldest one
+    waited `batch_interval` seconds, then written with os.writev, IOV_MAX records at a time.
+    An idle stream has its records written by the flusher thread once the interval is over,
+    and they are always written before the stream is closed, e.g. on rollover.
+    """
+
+    # handlers write records to a binary stream with write_record() instead of formatting them
+    binary = False
+
+    def __init__(self,
+                 filename: str,
+                 encoding: str = None,
+                 errors: str = None,
+                 batch_records: int = 1,
+                 batch_interval: float = 0.0,
+                 preallocate_bytes: int = 0):
+        self.name: str = filename
+        self.encoding: str = encoding or 'utf-8'
+        self.errors: str = errors or 'strict'
+        self.batch_records: int = batch_records
+        self.batch_interval: float = batch_interval
+
+        self._fd: int = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_CLOEXEC', 0), 0o666)
+        self._pos: int = os.fstat(self._fd).st_size
+        self._pending: List[bytes] = []
+        self._pending_bytes: int = 0
+        self._pending_since: float = 0.0
+        # the flusher thread writes pending records as well as the handler
+        self._lock = threading.Lock()
+
+        if preallocate_bytes > 0:
+            preallocate(self._fd, self._pos, preallocate_bytes)
+
+    @property
+    def closed(self) -> bool:
+        return self._fd < 0
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def write(self, s: str) -> int:
+        self.write_bytes(s.encode(self.encoding, self.errors))
+        return len(s)
+
+    def write_bytes(self, data: bytes):
+        if self.batch_records <= 1:
+            self._write([data])
+            return
+
+        with self._lock:
+            first = not self._pending
+            if first:
+                self._pending_since = time.monotonic()
+            self._pending.append(data)
+            self._pending_bytes += len(data)
+            if len(self._pending) >= self.batch_records \
+                    or time.monotonic() - self._pending_since >= self.batch_interval:
+                self._write_pending()
+                return
+        if first:
+            flusher.schedule(self, self._pending_since + self.batch_interval)
+
+    def flush(self):
+        """
+        Called by StreamHandler after every record, so pending records are only written
+        once batch_interval has passed. Use close() or sync_pending() to write them right away.
+        """
+        with self._lock:
+            if self._pending and time.monotonic() - self._pending_since >= self.batch_interval:
+                self._write_pending()
+
+    def flush_due(self) -> Optional[float]:
+        """
+        Called by the flusher. Write the pending records if their interval is over,
+        otherwise return when it will be.
+        """
+        with self._lock:
+            if self._fd < 0 or not self._pending:
+                return None
+            due = self._pending_since + self.batch_interval
+            if time.monotonic() < due:
+                return due
+            self._write_pending()
+            return None
+
+    def sync_pending(self):
+        with self._lock:
+            if self._pending:
+                self._write_pending()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        # writes always go to the end, only find out where that is now
+        if whence == os.SEEK_END:
+            self._pos = os.fstat(self._fd).st_size
+        return self.tell()
+
+    def tell(self) -> int:
+        return self._pos + self._pending_bytes
+
+    def close(self):
+        if self._fd < 0:
+            return
+        try:
+            self.sync_pending()
+        finally:
+            with self._lock:
+                os.close(self._fd)
+                self._fd = -1
+
+    def _write_pending(self):
+        # records stay pending until they are written, so a failed write loses none of them
+        while self._pending:
+            chunks = self._pending[:IOV_MAX]
+            self._write(chunks)
+            del self._pending[:len(chunks)]
+            self._pending_bytes -= sum(map(len, chunks))
+
+    def _write(self, chunks: List[bytes]):
+        if len(chunks) == 1 or not hasattr(os, 'writev'):
+            data = chunks[0] if len(chunks) == 1 else b''.join(chunks)
+            written = os.write(self._fd, data)
+        else:
+            data = None
+            written = os.writev(self._fd, chunks)
+
+        total = sum(map(len, chunks)) if data is None else len(data)
+        if written < total:
+            # short write, e.g. the disk is full or a signal came in
+            rest = memoryview(data if data is not None else b''.join(chunks))[written:]
+            while rest:
+                rest = rest[os.write(self._fd, rest):]
+        self._pos += total
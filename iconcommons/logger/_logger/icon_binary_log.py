@@ -0,0 +1,366 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compact binary log format.
+
+A file is a sequence of entries, each one 'kind(1) length(varint) payload(length)'.
+
+HEADER    magic 'ICLB', version(1), base time in microseconds(varint)
+STRING    id(varint), utf-8 text(rest), defines an interned string before its first use
+RECORD    time delta in microseconds from the previous record or header(zigzag varint),
+          level(varint), msecs(varint, from version 2), flags(1),
+          [tag id(varint)],
+          format id(varint) args count(varint) args... | message length(varint) utf-8 message,
+          [filename id(varint) lineno(varint) funcName id(varint)],
+          process(varint), thread(varint),
+          [exception length(varint) utf-8 exception text]
+
+msecs is the one of the LogRecord, it does not always equal what the truncated microseconds give.
+
+Every time a file is opened a HEADER starts a new session, string ids and the time base
+only hold within a session. So a file stays readable after rollover and after a restart
+appended to it, but it must not be shared by processes; use 'appendPid' for that.
+"""
+
+import logging
+import struct
+import time
+from typing import BinaryIO, Iterator, List, Optional
+
+from .icon_append_stream import IconAppendStream
+
+MAGIC = b'ICLB'
+VERSION = 2
+
+KIND_HEADER = 0x00
+KIND_STRING = 0x01
+KIND_RECORD = 0x02
+
+FLAG_TAG = 0x01
+FLAG_TAG_STRIPPED = 0x02
+FLAG_FORMAT = 0x04
+FLAG_CALLER = 0x08
+FLAG_EXC = 0x10
+
+ARG_NONE = 0
+ARG_INT = 1
+ARG_FLOAT = 2
+ARG_STR = 3
+ARG_BYTES = 4
+ARG_TRUE = 5
+ARG_FALSE = 6
+
+_double = struct.Struct("<d")
+
+
+def encode_varint(value: int, out: bytearray):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data: bytes, pos: int) -> tuple:
+    result = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7f) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _encode_args(args: tuple, out: bytearray) -> bool:
+    """
+    Append args to out, or return False if one of them has no binary form.
+    """
+    encode_varint(len(args), out)
+    for arg in args:
+        # bool before int since it is a subclass of int
+        if arg is True:
+            out.append(ARG_TRUE)
+        elif arg is False:
+            out.append(ARG_FALSE)
+        elif arg is None:
+            out.append(ARG_NONE)
+        elif type(arg) is int:
+            out.append(ARG_INT)
+            encode_varint(zigzag(arg), out)
+        elif type(arg) is float:
+            out.append(ARG_FLOAT)
+            out += _double.pack(arg)
+        elif type(arg) is str:
+            data = arg.encode()
+            out.append(ARG_STR)
+            encode_varint(len(data), out)
+            out += data
+        elif type(arg) is bytes:
+            out.append(ARG_BYTES)
+            encode_varint(len(arg), out)
+            out += arg
+        else:
+            return False
+    return True
+
+
+class IconBinaryStream(IconAppendStream):
+    """
+    IconAppendStream which writes records in the binary format instead of formatted text.
+    The file handlers call write_record() rather than format() and write().
+    """
+
+    binary = True
+
+    def __init__(self, filename: str, caller: bool = False, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.caller: bool = caller
+        self._strings: dict = {}
+        self._last_time: int = int(time.time() * 1_000_000)
+
+        payload = bytearray(MAGIC)
+        payload.append(VERSION)
+        encode_varint(self._last_time, payload)
+        self.write_bytes(self._entry(KIND_HEADER, payload))
+
+    def write_record(self, record: 'logging.LogRecord'):
+        out = bytearray()
+        body = bytearray()
+
+        created = int(record.created * 1_000_000)
+        encode_varint(zigzag(created - self._last_time), body)
+        self._last_time = created
+        encode_varint(record.levelno, body)
+        encode_varint(int(record.msecs), body)
+
+        flags = 0
+        flags_pos = len(body)
+        body.append(0)
+
+        tag: Optional[str] = getattr(record, 'tag', None)
+        if tag is not None:
+            flags |= FLAG_TAG
+            encode_varint(self._intern(tag, out), body)
+
+        args = record.args
+        if args and isinstance(args, tuple) and isinstance(record.msg, str):
+            fmt_id = self._intern(record.msg, out)
+            mark = len(body)
+            encode_varint(fmt_id, body)
+            if _encode_args(args, body):
+                flags |= FLAG_FORMAT
+            else:
+                del body[mark:]
+        if not flags & FLAG_FORMAT:
+            msg = record.getMessage()
+            if tag is not None and msg.startswith(tag) and msg[len(tag):len(tag) + 1] == " ":
+                # Logger made it with IconLoggerUtil.make_log_msg(), the decoder puts the tag back
+                flags |= FLAG_TAG_STRIPPED
+                msg = msg[len(tag) + 1:]
+            data = msg.encode(self.encoding, self.errors)
+            encode_varint(len(data), body)
+            body += data
+
+        if self.caller:
+            flags |= FLAG_CALLER
+            encode_varint(self._intern(record.filename, out), body)
+            encode_varint(record.lineno or 0, body)
+            encode_varint(self._intern(record.funcName or "", out), body)
+
+        encode_varint(record.process or 0, body)
+        encode_varint(record.thread or 0, body)
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        if record.exc_text:
+            flags |= FLAG_EXC
+            data = record.exc_text.encode(self.encoding, self.errors)
+            encode_varint(len(data), body)
+            body += data
+
+        body[flags_pos] = flags
+        out += self._entry(KIND_RECORD, body)
+        self.write_bytes(bytes(out))
+
+    def _intern(self, value: str, out: bytearray) -> int:
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings[value] = string_id
+            payload = bytearray()
+            encode_varint(string_id, payload)
+            payload += value.encode()
+            out += self._entry(KIND_STRING, payload)
+        return string_id
+
+    @staticmethod
+    def _entry(kind: int, payload: bytearray) -> bytes:
+        head = bytearray((kind,))
+        encode_varint(len(payload), head)
+        return bytes(head + payload)
+
+
+class IconBinaryDecoder(object):
+    """
+    Read a binary log back as LogRecords, or as text in the form of a LogConfig format.
+    """
+
+    def __init__(self, fmt: str = None):
+        from .icon_logger_util import LogConfig
+
+        self.formatter = logging.Formatter(fmt or LogConfig.DEFAULT_FORMAT)
+
+    def records(self, f: 'BinaryIO') -> Iterator['logging.LogRecord']:
+        strings: List[str] = []
+        last_time = 0
+        version = VERSION
+
+        while True:
+            entry = self._read_entry(f)
+            if entry is None:
+                break
+            kind, payload = entry
+
+            if kind == KIND_HEADER:
+                if payload[:4] != MAGIC:
+                    raise ValueError("Not a binary log")
+                version = payload[4]
+                if version > VERSION:
+                    raise ValueError(f"Unsupported binary log version: {version}")
+                last_time, _ = decode_varint(payload, 5)
+                strings = []
+            elif kind == KIND_STRING:
+                string_id, p = decode_varint(payload, 0)
+                if string_id != len(strings):
+                    raise ValueError(f"Unexpected string id: {string_id}")
+                strings.append(payload[p:].decode())
+            elif kind == KIND_RECORD:
+                record, last_time = self._decode_record(payload, strings, last_time, version)
+                yield record
+
+    def decode(self, f: 'BinaryIO') -> Iterator[str]:
+        for record in self.records(f):
+            yield self.formatter.format(record) + "\n"
+
+    @staticmethod
+    def _read_entry(f: 'BinaryIO') -> Optional[tuple]:
+        head = f.read(1)
+        if not head:
+            return None
+        length = 0
+        shift = 0
+        while True:
+            b = f.read(1)
+            if not b:
+                return None
+            length |= (b[0] & 0x7f) << shift
+            if b[0] < 0x80:
+                break
+            shift += 7
+        payload = f.read(length)
+        if len(payload) < length:
+            # the last entry was cut off by a crash
+            return None
+        return head[0], payload
+
+    @staticmethod
+    def _decode_record(payload: bytes, strings: List[str], last_time: int, version: int = VERSION) -> tuple:
+        delta, p = decode_varint(payload, 0)
+        created = last_time + unzigzag(delta)
+        levelno, p = decode_varint(payload, p)
+        if version >= 2:
+            msecs, p = decode_varint(payload, p)
+        else:
+            msecs = (created // 1000) % 1000
+        flags = payload[p]
+        p += 1
+
+        tag = None
+        if flags & FLAG_TAG:
+            tag_id, p = decode_varint(payload, p)
+            tag = strings[tag_id]
+
+        args = None
+        if flags & FLAG_FORMAT:
+            fmt_id, p = decode_varint(payload, p)
+            msg = strings[fmt_id]
+            count, p = decode_varint(payload, p)
+            args = []
+            for _ in range(count):
+                arg_type = payload[p]
+                p += 1
+                if arg_type == ARG_INT:
+                    value, p = decode_varint(payload, p)
+                    args.append(unzigzag(value))
+                elif arg_type == ARG_FLOAT:
+                    args.append(_double.unpack_from(payload, p)[0])
+                    p += _double.size
+                elif arg_type in (ARG_STR, ARG_BYTES):
+                    length, p = decode_varint(payload, p)
+                    value = payload[p:p + length]
+                    args.append(value.decode() if arg_type == ARG_STR else bytes(value))
+                    p += length
+                else:
+                    args.append({ARG_NONE: None, ARG_TRUE: True, ARG_FALSE: False}[arg_type])
+            args = tuple(args)
+        else:
+            length, p = decode_varint(payload, p)
+            msg = payload[p:p + length].decode(errors='replace')
+            p += length
+            if flags & FLAG_TAG_STRIPPED:
+                msg = f"{tag} {msg}"
+
+        filename, lineno, func_name = "(unknown file)", 0, "(unknown function)"
+        if flags & FLAG_CALLER:
+            file_id, p = decode_varint(payload, p)
+            lineno, p = decode_varint(payload, p)
+            func_id, p = decode_varint(payload, p)
+            filename, func_name = strings[file_id], strings[func_id]
+
+        process, p = decode_varint(payload, p)
+        thread, p = decode_varint(payload, p)
+
+        exc_text = None
+        if flags & FLAG_EXC:
+            length, p = decode_varint(payload, p)
+            exc_text = payload[p:p + length].decode(errors='replace')
+
+        record = logging.makeLogRecord({
+            'msg': msg,
+            'args': args,
+            'levelno': levelno,
+            'levelname': logging.getLevelName(levelno),
+            'pathname': filename,
+            'filename': filename,
+            'module': filename.rsplit(".", 1)[0],
+            'lineno': lineno,
+            'funcName': func_name,
+            'process': process,
+            'thread': thread,
+            'exc_text': exc_text,
+            'tag': tag,
+        })
+        record.created = created / 1_000_000
+        record.msecs = msecs
+        return record, created
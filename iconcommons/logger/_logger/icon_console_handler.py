@@ -0,0 +1,121 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import Counter, deque
+from logging import StreamHandler, LogRecord, WARNING, getLevelName
+from typing import List, Optional
+
+from .utils import report_error
+
+
+class IconConsoleHandler(StreamHandler):
+    """
+    StreamHandler which never lets callers wait on a slow console.
+
+    emit() only appends the record to a buffer, a writer thread formats the records
+    and writes them to the stream. Once `buffer_size` records are waiting, records below
+    `keep_level` are dropped; records at `keep_level` and above still get in until the buffer
+    holds twice as many. The writer puts a line with the number of dropped records per level
+    into the output where they went missing.
+    """
+
+    def __init__(self,
+                 stream=None,
+                 buffer_size: int = 10000,
+                 keep_level: int = WARNING,
+                 timeout: float = 5.0):
+        super().__init__(stream)
+        self.buffer_size: int = buffer_size
+        self.keep_level: int = keep_level
+        self.timeout: float = timeout
+        # total number of dropped records, for monitoring
+        self.dropped: int = 0
+
+        self._buffer: deque = deque()
+        self._dropped_levels: Counter = Counter()
+        self._cond = threading.Condition(threading.Lock())
+        self._closed: bool = False
+
+        self._thread = threading.Thread(target=self._run, name="IconConsoleHandler", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: 'LogRecord'):
+        with self._cond:
+            size = len(self._buffer)
+            if size >= self.buffer_size and (record.levelno < self.keep_level or size >= self.buffer_size * 2):
+                self.dropped += 1
+                self._dropped_levels[record.levelno] += 1
+                return
+            self._buffer.append(record)
+            if size == 0:
+                self._cond.notify()
+
+    def flush(self):
+        """
+        Does not wait for the writer, the stream is flushed after every batch.
+        """
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            # a console which does not take anything any more must not hang the shutdown
+            self._thread.join(self.timeout)
+        super().close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._buffer and not self._dropped_levels and not self._closed:
+                    self._cond.wait()
+                records = list(self._buffer)
+                self._buffer.clear()
+                dropped = self._dropped_levels
+                self._dropped_levels = Counter()
+                done = self._closed
+
+            lines = []
+            for record in records:
+                line = self._format(record)
+                if line is not None:
+                    lines.append(line)
+            # records are dropped while the buffer is full, so after the ones in it
+            if dropped:
+                lines.append(self._format_dropped(dropped))
+            if lines:
+                self._write(lines)
+            if done:
+                break
+
+    def _format(self, record: 'LogRecord') -> Optional[str]:
+        try:
+            return self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return None
+
+    def _format_dropped(self, dropped: Counter) -> str:
+        counts = " ".join(f"{getLevelName(level)}={count}" for level, count in sorted(dropped.items()))
+        record = LogRecord("console", WARNING, __file__, 0,
+                           f"console dropped {sum(dropped.values())} records: {counts}", None, None)
+        return self.format(record) + self.terminator
+
+    def _write(self, lines: List[str]):
+        try:
+            self.stream.write("".join(lines))
+            self.stream.flush()
+        except Exception:
+            report_error()
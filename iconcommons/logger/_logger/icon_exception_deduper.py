@@ -0,0 +1,82 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+
+def exception_key(exc_info: tuple) -> tuple:
+    """
+    Exception type and the (code, line) of every traceback frame, without formatting anything.
+    """
+    exc_type, _, tb = exc_info
+    frames = []
+    while tb is not None:
+        frames.append((tb.tb_frame.f_code, tb.tb_lineno))
+        tb = tb.tb_next
+    return (exc_type,) + tuple(frames)
+
+
+def fingerprint(key: tuple) -> str:
+    """
+    Short id of an exception_key which stays the same across processes and restarts.
+    """
+    exc_type = key[0]
+    text = f"{exc_type.__module__}.{exc_type.__qualname__}" + "".join(
+        f"|{code.co_filename}:{code.co_name}:{line}" for code, line in key[1:])
+    return f"{zlib.crc32(text.encode()):08x}"
+
+
+class IconExceptionDeduper(object):
+    """
+    Let the traceback of an exception be written once per `window` seconds.
+
+    check() is called by Logger before a record is made. For the first occurrence in a window
+    it returns the fingerprint and the record keeps its exc_info, repeats get the fingerprint
+    and the number of repeats so far, and the record goes out without a traceback.
+    At most `max_entries` fingerprints are remembered.
+    """
+
+    def __init__(self, window: float = 60.0, max_entries: int = 1024):
+        self.window: float = window
+        self.max_entries: int = max_entries
+        # key -> [fingerprint, time written in full, repeats]
+        self._seen: 'OrderedDict' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, exc_info: tuple) -> tuple:
+        """
+        Return (fingerprint, repeats), where repeats is 0 when the traceback should be written.
+        """
+        key = exception_key(exc_info)
+        now = time.monotonic()
+        with self._lock:
+            entry: Optional[list] = self._seen.get(key)
+            if entry is not None and now - entry[1] < self.window:
+                entry[2] += 1
+                return entry[0], entry[2]
+
+            if entry is None:
+                entry = [fingerprint(key), now, 0]
+                self._seen[key] = entry
+                if len(self._seen) > self.max_entries:
+                    self._seen.popitem(last=False)
+            else:
+                entry[1] = now
+                entry[2] = 0
+                self._seen.move_to_end(key)
+            return entry[0], 0
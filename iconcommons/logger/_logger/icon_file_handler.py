@@ -0,0 +1,32 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from logging import FileHandler
+
+from .icon_handler_utils import IconFileHandlerMixin
+
+
+class IconFileHandler(IconFileHandlerMixin, FileHandler):
+    """
+    FileHandler for output without 'rotate', which takes part in durability like the rotating handlers.
+    """
+
+    def __init__(self, filename, mode='a', encoding=None, delay=False):
+        super().__init__(filename, mode, encoding, delay)
+
+        self.index_writer = None
+        self.syncer = None
+
+    def shouldRollover(self, record):
+        return False
@@ -0,0 +1,94 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from logging import FileHandler, Handler
+
+from .icon_log_syncer import sync_stream
+
+
+class IconFileHandlerMixin(object):
+    """
+    Open, handle and emit of the iconcommons file handlers, put before the logging handler in the bases.
+
+    A stream_factory set on the handler class opens the log file instead of the logging handler.
+    """
+    # a class attribute, since the stream is opened from the __init__ of the logging handler
+    stream_factory = None
+
+    def _open(self):
+        if self.stream_factory is not None:
+            return self.stream_factory(self.baseFilename, encoding=self.encoding, errors=getattr(self, 'errors', None))
+        return super()._open()
+
+    def handle(self, record) -> bool:
+        """
+        Handler.handle(), which waits for the syncer after the handler lock is released,
+        so other records can join the same sync.
+        """
+        rv = Handler.handle(self, record)
+        if rv and self.syncer is not None:
+            self.syncer.wait_for(record)
+        return rv
+
+    def emit(self, record):
+        """
+        Emit a record after the rollover check, see write_record().
+        """
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            self.write_record(record)
+        except Exception:
+            self.handleError(record)
+
+    def write_record(self, record):
+        """
+        Write a record to the stream.
+
+        Marks the record in the time index if there is one and lets a binary stream
+        encode the record itself instead of formatting it. A record which was formatted
+        for the rollover check is not formatted again.
+        """
+        if self.stream is None and (self.index_writer is not None or self.stream_factory is not None):
+            self.stream = self._open()
+        if self.index_writer is not None:
+            self.index_writer.mark(self.stream, record.created)
+        formatted = getattr(self, 'formatted', None)
+        if getattr(self.stream, 'binary', False):
+            self.stream.write_record(record)
+            self.flush()
+        elif formatted is not None and formatted[0] is record:
+            # formatted by the size check of shouldRollover()
+            self.formatted = None
+            if self.stream is None:
+                # closed by a rollover with delay
+                self.stream = self._open()
+            self.stream.write(formatted[1] + self.terminator)
+            self.flush()
+        else:
+            FileHandler.emit(self, record)
+        if self.syncer is not None:
+            self.syncer.mark(self)
+
+
+def close_stream(handler):
+    """
+    Close the stream of an iconcommons file handler before it is renamed by a rollover.
+    With a syncer the file is synced first, so that a backup is complete on disk.
+    """
+    if handler.stream:
+        if handler.syncer is not None:
+            sync_stream(handler.stream)
+        handler.stream.close()
+        handler.stream = None
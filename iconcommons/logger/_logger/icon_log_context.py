@@ -0,0 +1,62 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from typing import Optional
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # python 3.6
+    ContextVar = None
+
+
+class LogContext(object):
+    """
+    Fields bound by Logger.context(), with the message prefix rendered once.
+    """
+
+    def __init__(self, parent: Optional['LogContext'], fields: dict):
+        if parent is not None:
+            merged = dict(parent.fields)
+            merged.update(fields)
+            fields = merged
+        self.fields: dict = fields
+        self.prefix: str = "[" + " ".join(f"{key}={value}" for key, value in fields.items()) + "] "
+
+
+class _ThreadLocalVar(object):
+    """
+    ContextVar look-alike for python 3.6, bound per thread only,
+    so asyncio tasks running in one thread see and overwrite each other's fields.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self):
+        return getattr(self._local, 'value', None)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+if ContextVar is not None:
+    log_context = ContextVar('iconcommons_log_context', default=None)
+else:
+    log_context = _ThreadLocalVar()
@@ -0,0 +1,103 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from typing import List, Tuple
+
+from .utils import index_ext
+
+
+def index_path(file_path: str) -> str:
+    return file_path + index_ext
+
+
+def remove_log_file(file_path: str):
+    """
+    Remove a rotated log file together with its sidecar time index.
+    """
+    os.remove(file_path)
+    idx = index_path(file_path)
+    if os.path.exists(idx):
+        os.remove(idx)
+
+
+def read_index(file_path: str) -> List[Tuple[float, int]]:
+    """
+    Read the sidecar time index of file_path as a list of (created, offset).
+
+    Entries pointing past the end of the log file are dropped,
+    they are leftovers of a file that was truncated or replaced.
+    """
+    idx = index_path(file_path)
+    try:
+        size = os.path.getsize(file_path)
+        with open(idx) as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+
+    entries = []
+    for line in lines:
+        try:
+            created, offset = line.split()
+            entry = (float(created), int(offset))
+        except ValueError:
+            # partially written line
+            continue
+        if entry[1] <= size:
+            entries.append(entry)
+    return entries
+
+
+class IconLogIndexWriter(object):
+    """
+    Sparse time index for a log file.
+
+    An index line '<created> <offset>' is appended to '<file>.idx' before the first record
+    of the file and then every `every_records` records or `every_bytes` bytes, whichever comes first.
+    The index file is opened only when an entry is written, so it needs no lifecycle of its own.
+    """
+
+    def __init__(self, base_filename: str, every_records: int = 1000, every_bytes: int = 1024 * 1024):
+        self.index_filename: str = index_path(base_filename)
+        self.every_records: int = every_records
+        self.every_bytes: int = every_bytes
+        self._count: int = 0
+        self._offset: int = -1
+
+    def mark(self, stream, created: float):
+        """
+        Called with the stream positioned at the start of the next record.
+        """
+        offset = stream.tell()
+        self._count += 1
+        if 0 <= self._offset <= offset \
+                and self._count <= self.every_records \
+                and offset - self._offset < self.every_bytes:
+            return
+
+        # a record at offset 0 starts a new file, so drop whatever index was left behind
+        with open(self.index_filename, 'w' if offset == 0 else 'a') as f:
+            f.write(f'{created:.6f} {offset}\n')
+        self._count = 1
+        self._offset = offset
+
+    def rotate(self, dest: str):
+        """
+        Move the index along with its log file renamed to dest.
+        """
+        if os.path.exists(self.index_filename):
+            os.rename(self.index_filename, index_path(dest))
+        self._count = 0
+        self._offset = -1
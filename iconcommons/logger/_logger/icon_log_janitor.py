@@ -0,0 +1,129 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+import time
+from queue import Queue
+from typing import Callable, List
+
+from .icon_log_index import index_path, remove_log_file
+from .utils import extMatch as rotate_extMatch, report_error
+
+
+def backup_files(base_filename: str) -> List[str]:
+    """
+    Rotated backups of base_filename from oldest to newest.
+    """
+    dir_name, base_name = os.path.split(base_filename)
+    prefix = base_name + "."
+    plen = len(prefix)
+    backups = []
+    for file_name in os.listdir(dir_name):
+        if file_name[:plen] == prefix:
+            suffix = file_name[plen:]
+            if rotate_extMatch.match(suffix):
+                stamp, _, index = suffix.partition(".")
+                backups.append((stamp, int(index or 0), os.path.join(dir_name, file_name)))
+    backups.sort()
+    return [path for _, _, path in backups]
+
+
+def files_over_budget(base_filename: str, max_total_bytes: int = None, max_age_days: float = None) -> List[str]:
+    """
+    Oldest backups to delete so that the rest are younger than max_age_days
+    and take max_total_bytes at most, together with their time index.
+    """
+    if not max_total_bytes and not max_age_days:
+        return []
+
+    sizes = []
+    for path in backup_files(base_filename):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        size = st.st_size
+        idx = index_path(path)
+        if os.path.exists(idx):
+            size += os.path.getsize(idx)
+        sizes.append((path, size, st.st_mtime))
+
+    result = []
+    if max_age_days:
+        expire = time.time() - max_age_days * 24 * 60 * 60
+        while sizes and sizes[0][2] < expire:
+            result.append(sizes.pop(0)[0])
+    if max_total_bytes:
+        total = sum(size for _, size, _ in sizes)
+        while sizes and total > max_total_bytes:
+            path, size, _ = sizes.pop(0)
+            result.append(path)
+            total -= size
+    return result
+
+
+def remove_files(paths: List[str]):
+    for path in paths:
+        try:
+            remove_log_file(path)
+        except FileNotFoundError:
+            # deleted by another process sharing the log
+            pass
+
+
+class IconLogJanitor(object):
+    """
+    Runs retention of rotated logs in a background thread, so that a rollover
+    only has to rename and reopen while callers wait on the handler lock.
+
+    A job submitted again while it is still queued runs once.
+    """
+
+    def __init__(self):
+        self._queue: 'Queue' = Queue()
+        self._pending: set = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread = None
+
+    def submit(self, job: Callable):
+        with self._lock:
+            if job in self._pending:
+                return
+            self._pending.add(job)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="IconLogJanitor", daemon=True)
+                self._thread.start()
+        self._queue.put(job)
+
+    def join(self):
+        """
+        Wait until all submitted jobs are done.
+        """
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                self._pending.discard(job)
+            try:
+                job()
+            except Exception:
+                report_error()
+            finally:
+                self._queue.task_done()
+
+
+janitor = IconLogJanitor()
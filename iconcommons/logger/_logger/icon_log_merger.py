@@ -0,0 +1,67 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import os
+from typing import Callable, Iterable, Iterator, List, TextIO
+
+from .icon_log_reader import IconLogReader, AsctimeParser
+from .utils import pid_file_match, extMatch as rotate_extMatch
+
+
+def process_log_paths(file_path: str) -> List[str]:
+    """
+    Paths of all processes that logged to file_path with 'appendPid' on, plus file_path itself.
+    A process is found by its current file or by any of its rotated backups.
+    """
+    file_path = os.path.abspath(file_path)
+    dir_name = os.path.dirname(file_path)
+    pattern = pid_file_match(file_path)
+    paths = set()
+    for file_name in os.listdir(dir_name):
+        m = pattern.match(file_name)
+        if m is None:
+            continue
+        rest = file_name[m.end():]
+        if not rest or (rest[0] == "." and rotate_extMatch.match(rest[1:])):
+            paths.add(os.path.join(dir_name, m.group(0)))
+    return sorted(paths) + [file_path]
+
+
+def merge_logs(file_paths: Iterable[str],
+               start: float = None,
+               end: float = None,
+               parser_factory: Callable = AsctimeParser) -> Iterator[str]:
+    """
+    Merge records of several logs, each with its rotated backups, into one timeline.
+
+    Every log is already in time order, so a heap holding the next record of each log
+    is enough and memory does not grow with the size of the logs.
+    Records with the same time keep the order of file_paths.
+    """
+    readers = [IconLogReader(path, parser_factory()) for path in file_paths]
+    streams = [reader.records(start, end) for reader in readers]
+    for _, record in heapq.merge(*streams, key=lambda r: r[0]):
+        yield record
+
+
+def write_merged(file_paths: Iterable[str], out: 'TextIO', **kwargs) -> int:
+    """
+    Write merge_logs() to out and return the number of records.
+    """
+    count = 0
+    for record in merge_logs(file_paths, **kwargs):
+        out.write(record)
+        count += 1
+    return count
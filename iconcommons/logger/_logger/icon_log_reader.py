@@ -0,0 +1,194 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import re
+import time
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Optional, Tuple
+
+from .icon_log_index import read_index
+from .icon_log_janitor import backup_files
+
+asctime_p = re.compile(rb"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),(\d{3})")
+
+
+class AsctimeParser(object):
+    """
+    Parse the '%(asctime)s' prefix of a record line, as written by the default LogConfig format.
+
+    Consecutive records mostly share the same second, so the last converted second is cached.
+    """
+
+    def __init__(self):
+        self._last_sec: bytes = b''
+        self._last_epoch: float = 0.0
+
+    def __call__(self, line: bytes) -> Optional[float]:
+        m = asctime_p.match(line)
+        if m is None:
+            return None
+        sec = m.group(1)
+        if sec != self._last_sec:
+            self._last_epoch = time.mktime(time.strptime(sec.decode(), "%Y-%m-%d %H:%M:%S"))
+            self._last_sec = sec
+        return self._last_epoch + int(m.group(2)) / 1000
+
+
+class JsonTimeParser(object):
+    """
+    Take the time of a record written as one JSON object per line from `field`,
+    either epoch seconds or an asctime string.
+    """
+
+    def __init__(self, field: str = 'time'):
+        self.field: str = field
+        self._asctime = AsctimeParser()
+
+    def __call__(self, line: bytes) -> Optional[float]:
+        if not line.startswith(b'{'):
+            return None
+        try:
+            value = json.loads(line)[self.field]
+        except (ValueError, KeyError, TypeError):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            return self._asctime(value.encode())
+        return None
+
+
+class IconLogReader(object):
+    """
+    Read records between two timestamps from a log file and its rotated backups.
+
+    Backups are ordered by their rotate suffix ('%Y%m%d-%H%M%S' and the optional '.N' index),
+    the first file to read is found with a binary search over the start time of each file
+    and the position inside it is looked up in the sidecar time index, if there is one.
+    Lines not starting with a timestamp (tracebacks) belong to the record before them.
+    """
+
+    def __init__(self, file_path: str, parse_time=None):
+        self.file_path: str = os.path.abspath(file_path)
+        self.parse_time = AsctimeParser() if parse_time is None else parse_time
+        self._start_times: dict = {}
+
+    def files(self) -> List[str]:
+        """
+        Rotated backups from oldest to newest, followed by the current file.
+        """
+        result = backup_files(self.file_path)
+        if os.path.exists(self.file_path):
+            result.append(self.file_path)
+        return result
+
+    def start_time(self, path: str) -> Optional[float]:
+        """
+        Time of the first record in path, from its index or its first timestamped line.
+        """
+        if path == self.file_path or path not in self._start_times:
+            start = None
+            index = read_index(path)
+            if index:
+                start = index[0][0]
+            else:
+                with open(path, 'rb') as f:
+                    for line in f:
+                        start = self.parse_time(line)
+                        if start is not None:
+                            break
+            # the current file changes with every rollover, so it is not cached
+            if path == self.file_path:
+                return start
+            self._start_times[path] = start
+        return self._start_times[path]
+
+    def query(self, start: float = None, end: float = None) -> Iterator[str]:
+        """
+        Yield records with start <= created <= end, in the order they were written.
+        """
+        for _, record in self.records(start, end):
+            yield record
+
+    def records(self, start: float = None, end: float = None) -> Iterator[Tuple[float, str]]:
+        """
+        Same as query() but yield (created, record).
+        """
+        files = self.files()
+        first = self._find_first_file(files, start) if start is not None else 0
+        for path in files[first:]:
+            if end is not None:
+                file_start = self.start_time(path)
+                if file_start is not None and file_start > end:
+                    return
+            for created, record in self._read_file(path, start, end):
+                # records of concurrent threads can be slightly out of order, so a record
+                # after end does not mean that none of the following ones is in range
+                if (start is None or created >= start) and (end is None or created <= end):
+                    yield created, record
+
+    def _find_first_file(self, files: List[str], start: float) -> int:
+        # last file whose first record is not after start
+        lo, hi = 0, len(files)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            file_start = self.start_time(files[mid])
+            if file_start is None or file_start <= start:
+                lo = mid + 1
+            else:
+                hi = mid
+        return max(lo - 1, 0)
+
+    def _read_file(self, path: str, start: Optional[float], end: Optional[float]) -> Iterator[Tuple[float, str]]:
+        """
+        Yield the records of path from the index entry before start up to the one after end.
+        Without an index the whole file is read.
+        """
+        offset = 0
+        stop = None
+        index = read_index(path) if start is not None or end is not None else None
+        if index:
+            times = [created for created, _ in index]
+            # one more entry on both sides since records of concurrent threads can be slightly out of order
+            if start is not None:
+                i = bisect_left(times, start) - 2
+                offset = index[max(i, 0)][1]
+            if end is not None:
+                i = bisect_right(times, end) + 1
+                if i < len(index):
+                    stop = index[i][1]
+
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            pos = offset
+            created = None
+            lines = []
+            for line in f:
+                line_pos = pos
+                pos += len(line)
+                t = self.parse_time(line)
+                if t is None:
+                    if created is not None:
+                        lines.append(line)
+                    continue
+                if created is not None:
+                    yield created, b''.join(lines).decode(errors='replace')
+                if stop is not None and line_pos >= stop:
+                    return
+                created = t
+                lines = [line]
+            if created is not None:
+                yield created, b''.join(lines).decode(errors='replace')
@@ -0,0 +1,166 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import threading
+import time
+
+from .utils import report_error
+
+# fdatasync() leaves out metadata like mtime, the size of an appended file is still synced
+fdatasync = getattr(os, 'fdatasync', os.fsync)
+
+DURABILITY_NONE = 'none'
+DURABILITY_INTERVAL = 'interval'
+DURABILITY_ON_ERROR = 'onError'
+DURABILITY_ALWAYS = 'always'
+
+
+def flush_stream(stream):
+    """
+    Hand everything written to the stream over to the OS.
+    """
+    sync_pending = getattr(stream, 'sync_pending', None)
+    if sync_pending is not None:
+        sync_pending()
+    else:
+        stream.flush()
+
+
+def sync_stream(stream):
+    flush_stream(stream)
+    fdatasync(stream.fileno())
+
+
+class IconLogSyncer(object):
+    """
+    Makes records of the file handlers durable with grouped syncs from a background thread.
+
+    A handler marks itself dirty after each record, and the thread syncs all dirty handlers at once:
+    every `interval` seconds with DURABILITY_INTERVAL, or when a record asks to wait for it.
+    With DURABILITY_ALWAYS every record waits, with DURABILITY_ON_ERROR records of ERROR and above do,
+    after the handler lock was released. A record waits for the next round that starts after it was
+    written, so the records which arrive while one sync is running share the next one.
+    """
+
+    def __init__(self, mode: str, interval: float = None):
+        self.mode: str = mode
+        self.interval: float = interval
+
+        self._cond = threading.Condition()
+        self._dirty: set = set()
+        # number of sync rounds started, finished and waited for
+        self._started: int = 0
+        self._finished: int = 0
+        self._requested: int = 0
+        self._closed: bool = False
+        self._thread: threading.Thread = None
+
+    def mark(self, handler: 'logging.Handler'):
+        """
+        Called by a handler with its lock held, after a record was written.
+        """
+        with self._cond:
+            if self._closed or handler in self._dirty:
+                return
+            self._dirty.add(handler)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="IconLogSyncer", daemon=True)
+                self._thread.start()
+            elif self.mode == DURABILITY_INTERVAL and len(self._dirty) == 1:
+                # start counting the interval
+                self._cond.notify_all()
+
+    def wait_for(self, record: 'logging.LogRecord'):
+        """
+        Called by a handler without its lock, after mark(). Blocks until the record is on disk
+        if the mode asks for it.
+        """
+        if self.mode == DURABILITY_ALWAYS or (self.mode == DURABILITY_ON_ERROR and record.levelno >= logging.ERROR):
+            self.wait()
+
+    def wait(self):
+        with self._cond:
+            if self._closed or self._thread is None:
+                return
+            target = self._started + 1
+            if self._requested < target:
+                self._requested = target
+                self._cond.notify_all()
+            while self._finished < target and not self._closed:
+                self._cond.wait()
+
+    def close(self):
+        """
+        Sync what is left and stop the thread.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = None
+                while not self._closed and self._requested <= self._started:
+                    if self.mode == DURABILITY_INTERVAL and self._dirty:
+                        if deadline is None:
+                            deadline = time.monotonic() + self.interval
+                        timeout = deadline - time.monotonic()
+                        if timeout <= 0:
+                            break
+                        self._cond.wait(timeout)
+                    else:
+                        self._cond.wait()
+                closed = self._closed
+                self._started += 1
+                handlers = self._dirty
+                self._dirty = set()
+
+            for handler in handlers:
+                self._sync_handler(handler)
+
+            with self._cond:
+                self._finished = self._started
+                self._cond.notify_all()
+            if closed:
+                return
+
+    @staticmethod
+    def _sync_handler(handler: 'logging.Handler'):
+        # flush under the handler lock, but sync a duplicate of the descriptor out of it,
+        # so records can be written meanwhile and a rollover can not close it under us
+        fd = -1
+        try:
+            handler.acquire()
+            try:
+                stream = handler.stream
+                if stream is None or stream.closed:
+                    return
+                flush_stream(stream)
+                fd = os.dup(stream.fileno())
+            finally:
+                handler.release()
+            fdatasync(fd)
+        except Exception:
+            report_error()
+        finally:
+            if fd >= 0:
+                os.close(fd)
@@ -13,13 +13,27 @@
 # limitations under the License.
 
 import os
+import threading
 from datetime import time
 from enum import Flag
-from logging import Logger as builtinLogger, FileHandler, StreamHandler, Formatter, Handler
-from typing import Union
-
+from functools import partial
+from logging import Logger as builtinLogger, StreamHandler, Formatter, Handler, getLevelName
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .icon_append_stream import IconAppendStream
+from .icon_console_handler import IconConsoleHandler
+from .icon_binary_log import IconBinaryStream
+from .icon_exception_deduper import IconExceptionDeduper
+from .icon_file_handler import IconFileHandler
+from .icon_log_index import IconLogIndexWriter
+from .icon_message_limiter import IconMessageLimiter
+from .icon_log_syncer import IconLogSyncer, DURABILITY_NONE, DURABILITY_INTERVAL, DURABILITY_ON_ERROR, \
+    DURABILITY_ALWAYS
 from .icon_period_and_bytes_file_handler import IconPeriodAndBytesFileHandler
 from .icon_rotating_file_handler import IconRotatingFileHandler
+from .icon_shard_handler import IconShardHandler
+from .icon_socket_handler import IconSocketHandler
+from .utils import pid_file_path, shard_file_path
 from .icon_time_rotating_file_handler import IconTimeRotatingFileHandler
 
 import re
@@ -30,6 +44,7 @@ class OutputType(Flag):
     NONE = 0
     CONSOLE = 1
     FILE = 2
+    SOCKET = 4
 
 
 class RotateType(Flag):
@@ -46,13 +61,17 @@ class RotateConfig:
                  at_time: 'time',
                  interval: int,
                  max_bytes: int,
-                 backup_count: int):
+                 backup_count: int,
+                 max_total_bytes: int = None,
+                 max_age_days: float = None):
         self.rotate_type: 'RotateType' = rotate_type
         self.period: str = period
         self.at_time: 'time' = at_time
         self.interval: int = interval
         self.max_bytes: int = max_bytes
         self.backup_count: int = backup_count
+        self.max_total_bytes: int = max_total_bytes
+        self.max_age_days: float = max_age_days
 
     @classmethod
     def from_dict(cls, src_config: dict):
@@ -73,13 +92,17 @@ class RotateConfig:
         interval: int = config.get('interval')
         max_bytes: int = config.get('maxBytes')
         backup_count: int = config.get("backupCount")
+        max_total_bytes: int = config.get("maxTotalBytes")
+        max_age_days: float = config.get("maxAgeDays")
 
         return RotateConfig(rotate_type=rotate_type,
                             period=period,
                             at_time=at_time,
                             interval=interval,
                             max_bytes=max_bytes,
-                            backup_count=backup_count)
+                            backup_count=backup_count,
+                            max_total_bytes=max_total_bytes,
+                            max_age_days=max_age_days)
 
     @classmethod
     def _convert_at_time(cls, value: int) -> 'time':
@@ -104,6 +127,229 @@ class RotateConfig:
             raise ValueError("Invalid period")
 
 
+class IndexConfig:
+    def __init__(self,
+                 every_records: int,
+                 every_bytes: int):
+        self.every_records: int = every_records
+        self.every_bytes: int = every_bytes
+
+    @classmethod
+    def from_dict(cls, src_config: dict):
+        config: dict = src_config.get('timeIndex')
+        if config is None:
+            return
+
+        every_records: int = config.get('records', 1000)
+        every_bytes: int = config.get('bytes', 1024 * 1024)
+
+        return IndexConfig(every_records=every_records,
+                           every_bytes=every_bytes)
+
+
+class RawAppendConfig:
+    def __init__(self,
+                 batch_records: int,
+                 batch_interval: float,
+                 preallocate_bytes: int):
+        self.batch_records: int = batch_records
+        self.batch_interval: float = batch_interval
+        self.preallocate_bytes: int = preallocate_bytes
+
+    @classmethod
+    def from_dict(cls, src_config: dict):
+        config: dict = src_config.get('rawAppend')
+        if config is None:
+            return
+
+        batch_records: int = config.get('batchRecords', 1)
+        batch_interval: float = config.get('batchInterval', 0.0)
+        preallocate_bytes: int = config.get('preallocateBytes', 0)
+
+        return RawAppendConfig(batch_records=batch_records,
+                               batch_interval=batch_interval,
+                               preallocate_bytes=preallocate_bytes)
+
+
+class BinaryConfig:
+    def __init__(self,
+                 caller: bool):
+        self.caller: bool = caller
+
+    @classmethod
+    def from_dict(cls, src_config: dict):
+        config: dict = src_config.get('binary')
+        if config is None:
+            return
+
+        caller: bool = config.get('caller', False)
+
+        return BinaryConfig(caller=caller)
+
+
+class ConsoleConfig:
+    def __init__(self,
+                 buffer_size: int,
+                 keep_level: str):
+        self.buffer_size: int = buffer_size
+        self.keep_level: str = keep_level
+
+    @classmethod
+    def from_dict(cls, src_config: dict):
+        config: dict = src_config.get('console')
+        if config is None:
+            return
+
+        buffer_size: int = config.get('bufferSize', 10000)
+        keep_level: str = config.get('keepLevel', 'warning').upper()
+
+        return ConsoleConfig(buffer_size=buffer_size,
+                             keep_level=keep_level)
+
+
+class SocketConfig:
+    def __init__(self,
+                 address: str,
+                 framing: str,
+                 batch_size: int,
+                 flush_interval: float,
+                 buffer_size: int,
+                 spill_path: str,
+                 max_spill_bytes: int,
+                 reconnect_interval: float):
+        self.address: str = address
+        self.framing: str = framing
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.buffer_size: int = buffer_size
+        self.spill_path: str = spill_path
+        self.max_spill_bytes: int = max_spill_bytes
+        self.reconnect_interval: float = reconnect_interval
+
+    @classmethod
+    def from_dict(cls, src_config: dict):
+        config: dict = src_config.get('socket')
+        if config is None:
+            return
+
+        address: str = config.get('address')
+        if not address:
+            raise ValueError("socket.address is required")
+
+        return SocketConfig(address=address,
+                            framing=config.get('framing', 'length'),
+                            batch_size=config.get('batchSize', 100),
+                            flush_interval=config.get('flushInterval', 1.0),
+                            buffer_size=config.get('bufferSize', 10000),
+                            spill_path=config.get('spillPath'),
+                            max_spill_bytes=config.get('maxSpillBytes', 1024 * 1024 * 1024),
+                            reconnect_interval=config.get('reconnectInterval', 1.0))
+
+
+class DedupeConfig:
+    def __init__(self,
+                 window: float,
+                 max_entries: int):
+        self.window: float = window
+        self.max_entries: int = max_entries
+
+    @classmethod
+    def from_dict(cls, src_config: dict):
+        config: dict = src_config.get('exceptionDedupe')
+        if config is None:
+            return
+
+        window: float = config.get('window', 60.0)
+        max_entries: int = config.get('maxEntries', 1024)
+
+        return DedupeConfig(window=window,
+                            max_entries=max_entries)
+
+
+class MessageLimitConfig:
+    def __init__(self,
+                 max_bytes: int,
+                 side_path: str = None,
+                 max_side_bytes: int = 1024 * 1024 * 1024,
+                 max_pending_chars: int = 64 * 1024 * 1024):
+        self.max_bytes: int = max_bytes
+        self.side_path: str = side_path
+        self.max_side_bytes: int = max_side_bytes
+        self.max_pending_chars: int = max_pending_chars
+
+    @classmethod
+    def from_dict(cls, src_config: dict):
+        max_bytes: int = src_config.get('maxMessageBytes')
+        if not max_bytes:
+            return
+        if max_bytes < 0:
+            raise ValueError(f"Invalid maxMessageBytes: {max_bytes}")
+
+        side_path: str = src_config.get('oversizeFilePath')
+        max_side_bytes: int = src_config.get('oversizeMaxBytes', 1024 * 1024 * 1024)
+        max_pending_chars: int = src_config.get('oversizePendingChars', 64 * 1024 * 1024)
+
+        return MessageLimitConfig(max_bytes=max_bytes,
+                                  side_path=side_path,
+                                  max_side_bytes=max_side_bytes,
+                                  max_pending_chars=max_pending_chars)
+
+
+class DurabilityConfig:
+    def __init__(self,
+                 mode: str,
+                 interval: float = None):
+        self.mode: str = mode
+        self.interval: float = interval
+
+    @classmethod
+    def from_dict(cls, src_config: dict):
+        value: str = src_config.get('durability')
+        if value is None or value == DURABILITY_NONE:
+            return
+
+        if value in (DURABILITY_ON_ERROR, DURABILITY_ALWAYS):
+            return DurabilityConfig(mode=value)
+
+        mode, _, interval = value.partition(':')
+        if mode == DURABILITY_INTERVAL and interval.isdigit() and int(interval) > 0:
+            return DurabilityConfig(mode=mode,
+                                    interval=int(interval) / 1000)
+        raise ValueError(f"Invalid durability: {value}")
+
+
+class ShardConfig:
+    def __init__(self,
+                 tags: Dict[str, Tuple[str, 'RotateConfig']],
+                 hash_paths: List[str]):
+        # tag -> (file path, rotate config)
+        self.tags: Dict[str, Tuple[str, 'RotateConfig']] = tags
+        self.hash_paths: List[str] = hash_paths
+
+    @classmethod
+    def from_dict(cls, src_config: dict, file_path: str, rotate_config: 'RotateConfig', pid: int = None):
+        config: dict = src_config.get('shards')
+        if config is None:
+            return
+
+        tags = {}
+        for tag, value in config.get('tags', {}).items():
+            if isinstance(value, str):
+                value = {'filePath': value}
+            tag_path: str = value.get('filePath')
+            if not tag_path:
+                raise ValueError(f"shards.tags.{tag}.filePath is required")
+            if pid is not None:
+                tag_path = pid_file_path(tag_path, pid)
+            tags[tag] = (tag_path, RotateConfig.from_dict(value) or rotate_config)
+
+        count: int = config.get('count', 0)
+        hash_paths = [shard_file_path(file_path, i) for i in range(count)]
+
+        return ShardConfig(tags=tags,
+                           hash_paths=hash_paths)
+
+
 class LogConfig:
     DEFAULT_FORMAT = "%(asctime)s %(process)d %(thread)d %(levelname)s %(filename)s(%(lineno)d) %(message)s"
 
@@ -113,7 +359,16 @@ class LogConfig:
                  file_path: str,
                  fmt: str,
                  output_type: 'OutputType',
-                 rotate_config: 'RotateConfig'):
+                 rotate_config: 'RotateConfig',
+                 index_config: 'IndexConfig' = None,
+                 socket_config: 'SocketConfig' = None,
+                 raw_append_config: 'RawAppendConfig' = None,
+                 dedupe_config: 'DedupeConfig' = None,
+                 binary_config: 'BinaryConfig' = None,
+                 durability_config: 'DurabilityConfig' = None,
+                 shard_config: 'ShardConfig' = None,
+                 console_config: 'ConsoleConfig' = None,
+                 message_limit_config: 'MessageLimitConfig' = None):
 
         self.name: str = name
         self.level: str = level
@@ -121,6 +376,15 @@ class LogConfig:
         self.fmt: str = fmt
         self.output_type: 'OutputType' = output_type
         self.rotate_config: 'RotateConfig' = rotate_config
+        self.index_config: 'IndexConfig' = index_config
+        self.socket_config: 'SocketConfig' = socket_config
+        self.raw_append_config: 'RawAppendConfig' = raw_append_config
+        self.dedupe_config: 'DedupeConfig' = dedupe_config
+        self.binary_config: 'BinaryConfig' = binary_config
+        self.durability_config: 'DurabilityConfig' = durability_config
+        self.shard_config: 'ShardConfig' = shard_config
+        self.console_config: 'ConsoleConfig' = console_config
+        self.message_limit_config: 'MessageLimitConfig' = message_limit_config
 
     @classmethod
     def from_dict(cls, src_config: dict):
@@ -131,6 +395,11 @@ class LogConfig:
         name: str = config.get('name', "ICONLogger")
         level: str = config.get('level', 'info').upper()
         file_path: str = config.get('filePath', "")
+        pid: int = None
+        if file_path and config.get('appendPid', False):
+            # each process rotates its own file, merge them back with 'iconlog merge'
+            pid = os.getpid()
+            file_path = pid_file_path(file_path, pid)
         fmt: str = config.get('format', cls.DEFAULT_FORMAT)
         output_type: 'OutputType' = OutputType.NONE
 
@@ -141,20 +410,69 @@ class LogConfig:
                 output_type |= OutputType[output.upper()]
 
         rotate_config: 'RotateConfig' = RotateConfig.from_dict(config)
-        return LogConfig(name, level, file_path, fmt, output_type, rotate_config)
+        index_config: 'IndexConfig' = IndexConfig.from_dict(config)
+        socket_config: 'SocketConfig' = SocketConfig.from_dict(config)
+        raw_append_config: 'RawAppendConfig' = RawAppendConfig.from_dict(config)
+        dedupe_config: 'DedupeConfig' = DedupeConfig.from_dict(config)
+        binary_config: 'BinaryConfig' = BinaryConfig.from_dict(config)
+        durability_config: 'DurabilityConfig' = DurabilityConfig.from_dict(config)
+        shard_config: 'ShardConfig' = ShardConfig.from_dict(config, file_path, rotate_config, pid)
+        console_config: 'ConsoleConfig' = ConsoleConfig.from_dict(config)
+        message_limit_config: 'MessageLimitConfig' = MessageLimitConfig.from_dict(config)
+        return LogConfig(name, level, file_path, fmt, output_type, rotate_config, index_config, socket_config,
+                         raw_append_config, dedupe_config, binary_config, durability_config, shard_config,
+                         console_config, message_limit_config)
 
 
 class IconLoggerUtil(object):
     _formatter: 'Formatter' = None
+    # used by Logger before a record with exc_info is made
+    exception_deduper: 'IconExceptionDeduper' = None
+    # used by Logger before a record is made of a message
+    message_limiter: 'IconMessageLimiter' = None
+    # shared by the file handlers, so records of all of them are synced together
+    syncer: 'IconLogSyncer' = None
+    # held while a config or a level is applied, including the level hooks
+    config_lock = threading.RLock()
+    # called with the logger whenever its level was set, e.g. by Logger to rebind its level methods
+    level_hooks: List[Callable[['builtinLogger'], None]] = []
+
+    @classmethod
+    def add_level_hook(cls, hook: Callable[['builtinLogger'], None]):
+        with cls.config_lock:
+            cls.level_hooks.append(hook)
 
     @classmethod
     def apply_config(cls, logger: 'builtinLogger', config: dict) -> None:
         log_config: 'LogConfig' = LogConfig.from_dict(config)
 
-        logger.handlers.clear()
-        logger.name = log_config.name
-        logger.setLevel(log_config.level)
-        cls._apply_config(logger, log_config)
+        with cls.config_lock:
+            # the syncer syncs what is left while the streams of the handlers are still open
+            if cls.syncer is not None:
+                cls.syncer.close()
+                cls.syncer = None
+            # handlers may own threads and sockets, so they are closed rather than just dropped
+            for handler in logger.handlers:
+                handler.close()
+            logger.handlers.clear()
+            logger.name = log_config.name
+            cls.set_level(logger, log_config.level)
+            cls._apply_config(logger, log_config)
+
+    @classmethod
+    def set_level(cls, logger: 'builtinLogger', level: Union[str, int]):
+        with cls.config_lock:
+            logger.setLevel(level)
+            cls.clear_level_cache(logger)
+            for hook in cls.level_hooks:
+                hook(logger)
+
+    @classmethod
+    def clear_level_cache(cls, logger: 'builtinLogger'):
+        # setLevel() only clears the isEnabledFor() cache of loggers made by logging.getLogger()
+        cache = getattr(logger, '_cache', None)
+        if cache is not None:
+            cache.clear()
 
     @classmethod
     def print_config(cls, logger: 'builtinLogger', config: dict):
@@ -176,39 +494,125 @@ class IconLoggerUtil(object):
     def _apply_config(cls, logger: 'builtinLogger', log_config: 'LogConfig'):
         cls._formatter = Formatter(log_config.fmt)
 
+        if log_config.dedupe_config is None:
+            cls.exception_deduper = None
+        else:
+            cls.exception_deduper = IconExceptionDeduper(log_config.dedupe_config.window,
+                                                         log_config.dedupe_config.max_entries)
+
+        if cls.message_limiter is not None:
+            cls.message_limiter.close()
+        if log_config.message_limit_config is None:
+            cls.message_limiter = None
+        else:
+            if log_config.message_limit_config.side_path is not None:
+                cls._ensure_dir(log_config.message_limit_config.side_path)
+            cls.message_limiter = IconMessageLimiter(log_config.message_limit_config.max_bytes,
+                                                     log_config.message_limit_config.side_path,
+                                                     log_config.message_limit_config.max_side_bytes,
+                                                     log_config.message_limit_config.max_pending_chars)
+
         if cls._is_flag_on(log_config.output_type, OutputType.CONSOLE):
-            handler = StreamHandler()
+            if log_config.console_config is None:
+                handler = StreamHandler()
+            else:
+                # a slow console drops records rather than slowing down the callers
+                handler = IconConsoleHandler(buffer_size=log_config.console_config.buffer_size,
+                                             keep_level=getLevelName(log_config.console_config.keep_level))
             handler.setFormatter(cls._formatter)
             logger.addHandler(handler)
 
         if cls._is_flag_on(log_config.output_type, OutputType.FILE):
-            cls._ensure_dir(log_config.file_path)
-
-            if log_config.rotate_config is None:
-                handler = cls.make_file_handler(log_config.file_path, cls._formatter)
+            handler = cls._make_file_output(log_config.file_path, log_config.rotate_config, log_config)
+            if log_config.shard_config is not None:
+                handler = cls.make_shard_handler(handler, log_config)
+            if handler is not None:
                 logger.addHandler(handler)
-            else:
-                rotate_type: 'Flag' = log_config.rotate_config.rotate_type
-                if cls._is_flag_on(rotate_type, RotateType.BOTH):
-                    handler = cls.make_period_and_bytes_file_handler(log_config.file_path,
-                                                                     log_config.rotate_config.period,
-                                                                     log_config.rotate_config.interval,
-                                                                     log_config.rotate_config.max_bytes,
-                                                                     log_config.rotate_config.backup_count,
-                                                                     log_config.rotate_config.at_time)
-                    logger.addHandler(handler)
-                elif cls._is_flag_on(rotate_type, RotateType.PERIOD):
-                    handler = cls.make_period_file_handler(log_config.file_path,
-                                                           log_config.rotate_config.period,
-                                                           log_config.rotate_config.interval,
-                                                           log_config.rotate_config.backup_count,
-                                                           log_config.rotate_config.at_time)
-                    logger.addHandler(handler)
-                elif cls._is_flag_on(rotate_type, RotateType.BYTES):
-                    handler = cls.make_bytes_file_handler(log_config.file_path,
-                                                          log_config.rotate_config.max_bytes,
-                                                          log_config.rotate_config.backup_count)
-                    logger.addHandler(handler)
+
+        if cls._is_flag_on(log_config.output_type, OutputType.SOCKET):
+            if log_config.socket_config is None:
+                raise ValueError("socket output needs a socket config")
+            handler = cls.make_socket_handler(log_config.socket_config)
+            logger.addHandler(handler)
+
+    @classmethod
+    def _make_file_output(cls,
+                          file_path: str,
+                          rotate_config: 'RotateConfig',
+                          log_config: 'LogConfig') -> Optional['Handler']:
+        cls._ensure_dir(file_path)
+
+        if rotate_config is None:
+            if log_config.binary_config is not None:
+                raise ValueError("binary output needs 'rotate'")
+            handler = cls.make_file_handler(file_path, cls._formatter)
+            if log_config.durability_config is not None:
+                handler.syncer = cls._get_syncer(log_config)
+            return handler
+
+        rotate_type: 'Flag' = rotate_config.rotate_type
+        if cls._is_flag_on(rotate_type, RotateType.BOTH):
+            handler = cls.make_period_and_bytes_file_handler(file_path,
+                                                             rotate_config.period,
+                                                             rotate_config.interval,
+                                                             rotate_config.max_bytes,
+                                                             rotate_config.backup_count,
+                                                             rotate_config.at_time)
+        elif cls._is_flag_on(rotate_type, RotateType.PERIOD):
+            handler = cls.make_period_file_handler(file_path,
+                                                   rotate_config.period,
+                                                   rotate_config.interval,
+                                                   rotate_config.backup_count,
+                                                   rotate_config.at_time)
+        elif cls._is_flag_on(rotate_type, RotateType.BYTES):
+            handler = cls.make_bytes_file_handler(file_path,
+                                                  rotate_config.max_bytes,
+                                                  rotate_config.backup_count)
+        else:
+            return None
+
+        cls._apply_rotating_options(handler, log_config, rotate_config)
+        return handler
+
+    @classmethod
+    def _apply_rotating_options(cls, handler: 'Handler', log_config: 'LogConfig', rotate_config: 'RotateConfig'):
+        # retention budget is enforced by the janitor after each rollover
+        handler.max_total_bytes = rotate_config.max_total_bytes
+        handler.max_age_days = rotate_config.max_age_days
+
+        if log_config.index_config is not None:
+            handler.index_writer = IconLogIndexWriter(handler.baseFilename,
+                                                      log_config.index_config.every_records,
+                                                      log_config.index_config.every_bytes)
+        if log_config.binary_config is not None or log_config.raw_append_config is not None:
+            cls._use_append_stream(handler, log_config)
+        if log_config.durability_config is not None:
+            handler.syncer = cls._get_syncer(log_config)
+
+    @classmethod
+    def _get_syncer(cls, log_config: 'LogConfig') -> 'IconLogSyncer':
+        # one syncer for all file handlers, so they share its syncs
+        if cls.syncer is None:
+            cls.syncer = IconLogSyncer(log_config.durability_config.mode,
+                                       log_config.durability_config.interval)
+        return cls.syncer
+
+    @classmethod
+    def _use_append_stream(cls, handler: 'Handler', log_config: 'LogConfig'):
+        kwargs = {}
+        if log_config.raw_append_config is not None:
+            kwargs.update(batch_records=log_config.raw_append_config.batch_records,
+                          batch_interval=log_config.raw_append_config.batch_interval,
+                          preallocate_bytes=log_config.raw_append_config.preallocate_bytes)
+        if log_config.binary_config is not None:
+            handler.stream_factory = partial(IconBinaryStream, caller=log_config.binary_config.caller, **kwargs)
+        else:
+            handler.stream_factory = partial(IconAppendStream, **kwargs)
+
+        # the handler opened its stream on creation
+        if handler.stream is not None:
+            handler.stream.close()
+            handler.stream = handler._open()
 
     @classmethod
     def _is_flag_on(cls, src_flag: 'Flag', dest_flag: 'Flag') -> bool:
@@ -235,7 +639,7 @@ class IconLoggerUtil(object):
     def make_file_handler(cls,
                           file_path: str,
                           formatter: 'Formatter') -> 'Handler':
-        handler = FileHandler(file_path, 'a')
+        handler = IconFileHandler(file_path, 'a')
         handler.setFormatter(formatter)
         return handler
 
@@ -282,5 +686,32 @@ class IconLoggerUtil(object):
         handler.setFormatter(cls._formatter)
         return handler
 
+    @classmethod
+    def make_shard_handler(cls, default: Optional['Handler'], log_config: 'LogConfig') -> 'Handler':
+        shard_config: 'ShardConfig' = log_config.shard_config
+        tag_handlers = {}
+        for tag, (file_path, rotate_config) in shard_config.tags.items():
+            handler = cls._make_file_output(file_path, rotate_config, log_config)
+            if handler is not None:
+                tag_handlers[tag] = handler
+        hash_handlers = [cls._make_file_output(file_path, log_config.rotate_config, log_config)
+                         for file_path in shard_config.hash_paths]
+        return IconShardHandler(default, tag_handlers, [handler for handler in hash_handlers if handler is not None])
+
+    @classmethod
+    def make_socket_handler(cls, socket_config: 'SocketConfig') -> 'Handler':
+        if socket_config.spill_path is not None:
+            cls._ensure_dir(socket_config.spill_path)
+        handler = IconSocketHandler(socket_config.address,
+                                    framing=socket_config.framing,
+                                    batch_size=socket_config.batch_size,
+                                    flush_interval=socket_config.flush_interval,
+                                    buffer_size=socket_config.buffer_size,
+                                    spill_path=socket_config.spill_path,
+                                    max_spill_bytes=socket_config.max_spill_bytes,
+                                    reconnect_interval=socket_config.reconnect_interval)
+        handler.setFormatter(cls._formatter)
+        return handler
+
 
 icon_logger = builtinLogger("ICONLogger")
@@ -0,0 +1,140 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+from .utils import report_error
+
+
+def truncate_utf8(msg: str, max_bytes: int) -> str:
+    """
+    Longest head of msg which takes max_bytes at most in utf-8, without encoding the rest of it.
+    """
+    return msg[:max_bytes].encode('utf-8', 'replace')[:max_bytes].decode('utf-8', 'ignore')
+
+
+class IconMessageLimiter(object):
+    """
+    Cut messages longer than `max_bytes` in utf-8 before a record is made of them.
+
+    The check costs a len() for all but messages near the limit. A message is cut
+    to max_bytes and gets a marker with its length in characters.
+
+    With `side_path` the whole message is appended there by a writer thread of its own,
+    under an id the marker names. At most `max_pending_chars` characters wait for the writer,
+    a message which does not fit any more is dropped and counted, and its marker says so.
+    Once the side file is bigger than `max_side_bytes` it is renamed to '<side_path>.1',
+    replacing the previous one, so side files take about twice max_side_bytes at most.
+    """
+
+    def __init__(self,
+                 max_bytes: int,
+                 side_path: str = None,
+                 max_side_bytes: int = 1024 * 1024 * 1024,
+                 max_pending_chars: int = 64 * 1024 * 1024):
+        self.max_bytes: int = max_bytes
+        self.side_path: str = side_path
+        self.max_side_bytes: int = max_side_bytes
+        self.max_pending_chars: int = max_pending_chars
+        # messages which were not written to the side file, for monitoring
+        self.dropped: int = 0
+
+        self._ids = itertools.count(1)
+        self._pending: deque = deque()
+        self._pending_chars: int = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._closed: bool = False
+        self._thread: threading.Thread = None
+
+    def limit(self, msg: str) -> str:
+        length = len(msg)
+        # a character takes 4 bytes at most
+        if length * 4 <= self.max_bytes:
+            return msg
+        if length <= self.max_bytes and len(msg.encode('utf-8', 'replace')) <= self.max_bytes:
+            return msg
+
+        head = truncate_utf8(msg, self.max_bytes)
+        if self.side_path is None:
+            return f"{head}... [truncated {length} chars]"
+
+        message_id = f"{os.getpid()}-{next(self._ids)}"
+        if not self._submit(message_id, msg):
+            return f"{head}... [truncated {length} chars, full message dropped]"
+        return f"{head}... [truncated {length} chars, full message {message_id} in {self.side_path}]"
+
+    def close(self, timeout: float = 5.0):
+        """
+        Stop the writer after it wrote what is pending.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _submit(self, message_id: str, msg: str) -> bool:
+        with self._cond:
+            if self._closed or self._pending_chars + len(msg) > self.max_pending_chars:
+                self.dropped += 1
+                return False
+            self._pending.append((message_id, msg))
+            self._pending_chars += len(msg)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="IconMessageLimiter", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                message_id, msg = self._pending[0]
+
+            try:
+                self._write_full(message_id, msg)
+            except Exception:
+                report_error()
+
+            with self._cond:
+                self._pending.popleft()
+                self._pending_chars -= len(msg)
+
+    def _write_full(self, message_id: str, msg: str):
+        data = f"=== {time.strftime('%Y-%m-%d %H:%M:%S')} {message_id} {len(msg)} chars\n{msg}\n".encode('utf-8', 'replace')
+        # O_APPEND, so that processes sharing the side file do not interleave
+        fd = os.open(self.side_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+        if size > self.max_side_bytes:
+            try:
+                os.replace(self.side_path, f"{self.side_path}.1")
+            except FileNotFoundError:
+                # rotated by another process sharing the side file
+                pass
@@ -18,11 +18,12 @@ import types
 from logging.handlers import BaseRotatingHandler
 from stat import ST_MTIME
 
+from .icon_handler_utils import IconFileHandlerMixin
 from .icon_rotating_file_handler import IconRotatingFileHandler
 from .icon_time_rotating_file_handler import IconTimeRotatingFileHandler
 
 
-class IconPeriodAndBytesFileHandler(BaseRotatingHandler):
+class IconPeriodAndBytesFileHandler(IconFileHandlerMixin, BaseRotatingHandler):
     def __init__(self, filename,
                  mode='a',
                  maxBytes=0,
@@ -62,6 +63,7 @@ class IconPeriodAndBytesFileHandler(BaseRotatingHandler):
         self.computeRollover = types.MethodType(IconTimeRotatingFileHandler.computeRollover, self)
         self.doRollover_bytes = types.MethodType(IconRotatingFileHandler.doRollover, self)
         self.getFilesToDelete = types.MethodType(IconRotatingFileHandler.getFilesToDelete, self)
+        self.cleanup = types.MethodType(IconRotatingFileHandler.cleanup, self)
         self.shouldRollover_period = types.MethodType(IconTimeRotatingFileHandler.shouldRollover, self)
         self.shouldRollover_bytes = types.MethodType(IconRotatingFileHandler.shouldRollover, self)
 
@@ -104,6 +106,11 @@ class IconPeriodAndBytesFileHandler(BaseRotatingHandler):
         # bytes
         self.rotator = types.MethodType(IconRotatingFileHandler.custom_rotator, self)
         self.logger_index = 0
+        self.index_writer = None
+        self.max_total_bytes = None
+        self.max_age_days = None
+        self.syncer = None
+        self.formatted = None
 
     def doRollover(self):
         # custom bytes + period
@@ -16,38 +16,75 @@ import os
 import time
 from logging.handlers import RotatingFileHandler
 
+from .icon_handler_utils import IconFileHandlerMixin, close_stream
+from .icon_log_janitor import janitor, files_over_budget, remove_files
 from .utils import suffix as rotate_suffix, extMatch as rotate_extMatch
 
 
-class IconRotatingFileHandler(RotatingFileHandler):
+class IconRotatingFileHandler(IconFileHandlerMixin, RotatingFileHandler):
     def __init__(self, filename, mode='a', maxBytes=0, backupCount=0, encoding=None, delay=False):
         super().__init__(filename, mode, maxBytes, backupCount, encoding, delay)
 
         self.rotator = self.custom_rotator
         self.logger_index = 0
+        self.index_writer = None
+        self.max_total_bytes = None
+        self.max_age_days = None
+        self.syncer = None
+        # (record, text) of the record shouldRollover() formatted last
+        self.formatted = None
 
     def custom_rotator(self, source, dest):
         if os.path.exists(dest):
             self.logger_index += 1
-            os.rename(source, f"{dest}.{self.logger_index}")
+            dest = f"{dest}.{self.logger_index}"
         elif os.path.exists(source):
             self.logger_index = 0
-            os.rename(source, dest)
+        else:
+            return
+        os.rename(source, dest)
+        if self.index_writer is not None:
+            self.index_writer.rotate(dest)
 
     def doRollover(self):
         """
         Do a rollover, as described in __init__().
         """
-        if self.stream:
-            self.stream.close()
-            self.stream = None
+        close_stream(self)
         dfn = self.rotation_filename(self.baseFilename + "." +
                                      time.strftime(rotate_suffix, time.localtime()))
         self.rotate(self.baseFilename, dfn)
-        for s in self.getFilesToDelete():
-            os.remove(s)
         if not self.delay:
             self.stream = self._open()
+        janitor.submit(self.cleanup)
+
+    def cleanup(self):
+        """
+        Delete backups beyond backupCount, max_total_bytes and max_age_days.
+        Without backupCount, or with 0 next to a budget, only the budget limits the backups.
+        Called from the janitor thread, out of the handler lock.
+        """
+        if self.backupCount or (self.backupCount == 0 and not (self.max_total_bytes or self.max_age_days)):
+            remove_files(self.getFilesToDelete())
+        remove_files(files_over_budget(self.baseFilename, self.max_total_bytes, self.max_age_days))
+
+    def shouldRollover(self, record):
+        """
+        Binary records are not formatted to be measured, such a file is rolled over
+        once it reached maxBytes instead.
+        A text record is formatted here once and write_record() writes that text.
+        """
+        if self.stream is None:
+            self.stream = self._open()
+        if getattr(self.stream, 'binary', False):
+            return self.maxBytes > 0 and self.stream.tell() >= self.maxBytes
+        if self.maxBytes <= 0:
+            return False
+
+        msg = self.format(record)
+        self.formatted = (record, msg)
+        self.stream.seek(0, 2)  # due to non-posix-compliant Windows feature
+        return self.stream.tell() + len(msg) + len(self.terminator) >= self.maxBytes
 
     # reference TimedRotatingFileHandler
     def getFilesToDelete(self):
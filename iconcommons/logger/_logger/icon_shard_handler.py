@@ -0,0 +1,83 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import zlib
+from logging import Handler, Formatter, LogRecord
+from typing import Dict, List, Optional
+
+
+class IconShardHandler(Handler):
+    """
+    Route records to file handlers by the tag Logger gave them.
+
+    A tag goes to its handler in `tag_handlers`, otherwise to one of `hash_handlers` by a hash
+    which is the same in every process, and records without a tag go to `default`.
+    The route of a tag is looked up once and then kept in a dict.
+    This handler takes no lock of its own, so records of different shards are written in parallel.
+    """
+
+    def __init__(self,
+                 default: Optional['Handler'],
+                 tag_handlers: Dict[str, 'Handler'],
+                 hash_handlers: List['Handler']):
+        super().__init__()
+        self.default: Optional['Handler'] = default
+        self.tag_handlers: Dict[str, 'Handler'] = tag_handlers
+        self.hash_handlers: List['Handler'] = hash_handlers
+        self._routes: Dict[Optional[str], Optional['Handler']] = dict(tag_handlers)
+
+    @property
+    def handlers(self) -> List['Handler']:
+        handlers = [] if self.default is None else [self.default]
+        return handlers + list(self.tag_handlers.values()) + self.hash_handlers
+
+    def route(self, tag: Optional[str]) -> Optional['Handler']:
+        try:
+            return self._routes[tag]
+        except KeyError:
+            pass
+
+        if tag is None or not self.hash_handlers:
+            handler = self.default
+        else:
+            handler = self.hash_handlers[zlib.crc32(tag.encode()) % len(self.hash_handlers)]
+        self._routes[tag] = handler
+        return handler
+
+    def handle(self, record: 'LogRecord') -> bool:
+        rv = self.filter(record)
+        if rv:
+            handler = self.route(getattr(record, 'tag', None))
+            if handler is not None:
+                handler.handle(record)
+        return rv
+
+    def emit(self, record: 'LogRecord'):
+        handler = self.route(getattr(record, 'tag', None))
+        if handler is not None:
+            handler.emit(record)
+
+    def setFormatter(self, fmt: 'Formatter'):
+        super().setFormatter(fmt)
+        for handler in self.handlers:
+            handler.setFormatter(fmt)
+
+    def flush(self):
+        for handler in self.handlers:
+            handler.flush()
+
+    def close(self):
+        for handler in self.handlers:
+            handler.close()
+        super().close()
@@ -0,0 +1,348 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from logging import Handler
+from typing import List, Optional
+
+_length = struct.Struct(">I")
+
+# keep datagrams below the usual udp payload limit
+MAX_DATAGRAM = 65000
+
+
+def parse_address(address: str) -> tuple:
+    """
+    'tcp://host:port', 'udp://host:port', 'unix:///path' or 'unixgram:///path'
+    to (family, type, address). An ipv6 host is written in brackets, 'tcp://[::1]:514'.
+    """
+    scheme, sep, rest = address.partition("://")
+    if not sep:
+        raise ValueError(f"Invalid socket address: {address}")
+
+    if scheme in ('tcp', 'udp'):
+        host, _, port = rest.rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Invalid socket address: {address}")
+        sock_type = socket.SOCK_STREAM if scheme == 'tcp' else socket.SOCK_DGRAM
+        if host.startswith("[") and host.endswith("]"):
+            return socket.AF_INET6, sock_type, (host[1:-1], int(port))
+        if ":" in host or "[" in host or "]" in host:
+            # an ipv6 host needs brackets, as in 'tcp://[::1]:514'
+            raise ValueError(f"Invalid socket address: {address}")
+        return socket.AF_INET, sock_type, (host, int(port))
+    elif scheme == 'unix':
+        return socket.AF_UNIX, socket.SOCK_STREAM, rest
+    elif scheme == 'unixgram':
+        return socket.AF_UNIX, socket.SOCK_DGRAM, rest
+    else:
+        raise ValueError(f"Invalid socket scheme: {scheme}")
+
+
+def frame_length(payload: bytes) -> bytes:
+    return _length.pack(len(payload)) + payload
+
+
+def frame_octet(payload: bytes) -> bytes:
+    # octet counting of RFC 6587, as syslog collectors expect it
+    return b"%d %s" % (len(payload), payload)
+
+
+class IconSocketHandler(Handler):
+    """
+    Ship formatted records to a collector over tcp, udp or a unix socket.
+
+    Callers only append the encoded record to a bounded buffer, a sender thread
+    takes up to `batch_size` records at a time (or whatever is there after `flush_interval`
+    seconds) and writes them framed with a length prefix in a single send.
+    While the collector is down, the sender keeps its batch and retries it. A record which
+    does not fit in the buffer is appended to `spill_path` together with the whole buffer,
+    so records reach the collector in the order they were logged.
+    Without a spill file, or once it holds `max_spill_bytes`, records are dropped and counted.
+    """
+
+    def __init__(self,
+                 address: str,
+                 framing: str = 'length',
+                 batch_size: int = 100,
+                 flush_interval: float = 1.0,
+                 buffer_size: int = 10000,
+                 spill_path: str = None,
+                 max_spill_bytes: int = 1024 * 1024 * 1024,
+                 reconnect_interval: float = 1.0,
+                 timeout: float = 5.0):
+        super().__init__()
+
+        self.family, self.sock_type, self.address = parse_address(address)
+        if framing == 'length':
+            self.frame = frame_length
+        elif framing == 'octet':
+            self.frame = frame_octet
+        else:
+            raise ValueError(f"Invalid framing: {framing}")
+
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.buffer_size: int = buffer_size
+        self.spill_path: Optional[str] = spill_path
+        self.max_spill_bytes: int = max_spill_bytes
+        self.reconnect_interval: float = reconnect_interval
+        self.timeout: float = timeout
+        self.dropped: int = 0
+
+        self._buffer: deque = deque()
+        self._cond = threading.Condition(threading.Lock())
+        self._closed: bool = False
+        self._sock: Optional[socket.socket] = None
+        self._next_connect: float = 0.0
+        # batch the sender took from the buffer and did not send yet,
+        # spilled records before _pending_after are older than it, the ones after it newer
+        self._pending: List[bytes] = []
+        self._pending_after: int = 0
+
+        # spill file holds 4 byte length prefixed payloads, _spill_offset is where replay continues.
+        # Spilled records are appended through one fd and _spill_size counts whole records only,
+        # so replay reads up to it without the lock.
+        self._spill_lock = threading.Lock()
+        self._spill_fd: Optional[int] = None
+        self._spill_offset: int = 0
+        self._spill_size: int = 0
+        if spill_path is not None and os.path.exists(spill_path):
+            self._spill_size = os.path.getsize(spill_path)
+
+        self._thread = threading.Thread(target=self._run, name="IconSocketHandler", daemon=True)
+        self._thread.start()
+
+    def emit(self, record):
+        try:
+            payload = self.format(record).encode()
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._cond:
+            if len(self._buffer) < self.buffer_size:
+                self._buffer.append(payload)
+                if len(self._buffer) >= self.batch_size:
+                    self._cond.notify()
+                return
+            if self.spill_path is None:
+                self._spill([payload])
+                return
+            # the buffer goes along, so spilled records are always older than the buffered ones
+            batch = list(self._buffer)
+            batch.append(payload)
+            self._buffer.clear()
+            self._spill(batch)
+
+    def flush(self):
+        """
+        Wake the sender up instead of waiting for flush_interval.
+        """
+        with self._cond:
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(self.timeout * 2)
+        self._disconnect()
+        with self._spill_lock:
+            if self._spill_fd is not None:
+                os.close(self._spill_fd)
+                self._spill_fd = None
+        super().close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed:
+                    if self._pending:
+                        # the collector is down, try again after reconnect_interval
+                        self._cond.wait(self.reconnect_interval)
+                    elif len(self._buffer) < self.batch_size:
+                        self._cond.wait(self.flush_interval)
+                if not self._pending:
+                    self._pending = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                    self._pending_after = self._spill_size
+                closed = self._closed
+
+            sent = True
+            if self._pending or self._spill_size > self._spill_offset:
+                sent = self._ship()
+            if closed:
+                with self._cond:
+                    if not sent:
+                        self._save()
+                        break
+                    if not self._buffer and self._spill_size <= self._spill_offset:
+                        break
+
+    def _ship(self) -> bool:
+        """
+        Send the spilled records which are older than the pending batch, then the batch.
+        Return False if the collector is down, the batch stays pending then.
+        """
+        if not self._connect():
+            return False
+        try:
+            if self._spill_size > self._spill_offset:
+                self._replay(self._pending_after if self._pending else None)
+            if self._pending:
+                self._send(self._pending)
+                self._pending = []
+        except OSError:
+            self._disconnect()
+            return False
+        return True
+
+    def _connect(self) -> bool:
+        if self._sock is not None:
+            return True
+        if time.monotonic() < self._next_connect:
+            return False
+
+        sock = socket.socket(self.family, self.sock_type)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(self.address)
+        except OSError:
+            sock.close()
+            self._next_connect = time.monotonic() + self.reconnect_interval
+            return False
+        self._sock = sock
+        return True
+
+    def _disconnect(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            self._next_connect = time.monotonic() + self.reconnect_interval
+
+    def _send(self, batch: List[bytes]):
+        frame = self.frame
+        if self.sock_type == socket.SOCK_STREAM:
+            self._sock.sendall(b"".join([frame(payload) for payload in batch]))
+            return
+
+        # one datagram holds as many whole records as fit
+        datagram = []
+        size = 0
+        for payload in batch:
+            data = frame(payload)
+            if datagram and size + len(data) > MAX_DATAGRAM:
+                self._sock.send(b"".join(datagram))
+                datagram = []
+                size = 0
+            datagram.append(data)
+            size += len(data)
+        if datagram:
+            self._sock.send(b"".join(datagram))
+
+    def _spill(self, batch: List[bytes]):
+        if not batch:
+            return
+        with self._spill_lock:
+            if self.spill_path is None:
+                self.dropped += len(batch)
+                return
+            data = b"".join([frame_length(payload) for payload in batch])
+            if self._spill_size + len(data) > self.max_spill_bytes:
+                self.dropped += len(batch)
+                return
+            self._write_spill(data)
+
+    def _write_spill(self, data: bytes):
+        if self._spill_fd is None:
+            self._spill_fd = os.open(self.spill_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._spill_fd, view):]
+        self._spill_size += len(data)
+
+    def _save(self):
+        """
+        Spill the pending batch and the buffer when closing while the collector is down.
+        The batch goes before the spilled records which are newer than it.
+        """
+        pending = self._pending
+        buffered = list(self._buffer)
+        self._pending = []
+        self._buffer.clear()
+
+        newer = b""
+        with self._spill_lock:
+            if pending and self.spill_path is not None and self._pending_after < self._spill_size:
+                with open(self.spill_path, 'rb') as f:
+                    f.seek(self._pending_after)
+                    newer = f.read(self._spill_size - self._pending_after)
+                os.truncate(self.spill_path, self._pending_after)
+                self._spill_size = self._pending_after
+        self._spill(pending)
+        if newer:
+            with self._spill_lock:
+                self._write_spill(newer)
+        self._spill(buffered)
+
+    def _replay(self, end: int = None):
+        """
+        Send what was spilled, batch_size records at a time, up to `end` or all of it.
+        On failure the remaining records stay in the file for the next connection.
+        """
+        with open(self.spill_path, 'rb') as f:
+            while True:
+                # callers may spill more while this is read and sent, they only append to the file
+                limit = self._spill_size if end is None else end
+                batch, read = self._read_spill(f, limit)
+                if not batch:
+                    # the rest of a file cut short
+                    self._spill_offset += read
+                    with self._spill_lock:
+                        if end is None and self._spill_size > limit:
+                            continue
+                        if self._spill_offset < self._spill_size:
+                            # records newer than the pending batch wait for it
+                            return
+                        if self._spill_fd is not None:
+                            os.close(self._spill_fd)
+                            self._spill_fd = None
+                        os.remove(self.spill_path)
+                        self._spill_offset = 0
+                        self._spill_size = 0
+                        self._pending_after = 0
+                        return
+                self._send(batch)
+                self._spill_offset += read
+
+    def _read_spill(self, f, end: int) -> tuple:
+        batch = []
+        read = 0
+        f.seek(self._spill_offset)
+        while len(batch) < self.batch_size and self._spill_offset + read < end:
+            header = f.read(_length.size)
+            if len(header) < _length.size:
+                # cut short by a crash of the process which spilled it, skip the rest
+                read = end - self._spill_offset
+                break
+            (length,) = _length.unpack(header)
+            batch.append(f.read(length))
+            read += _length.size + length
+        return batch, read
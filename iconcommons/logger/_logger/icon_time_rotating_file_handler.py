@@ -16,10 +16,13 @@ import os
 import time
 from logging.handlers import TimedRotatingFileHandler
 
+from .icon_handler_utils import IconFileHandlerMixin, close_stream
+from .icon_log_index import remove_log_file
+from .icon_log_janitor import janitor, files_over_budget, remove_files
 from .utils import suffix as rotate_suffix, extMatch as rotate_extMatch
 
 
-class IconTimeRotatingFileHandler(TimedRotatingFileHandler):
+class IconTimeRotatingFileHandler(IconFileHandlerMixin, TimedRotatingFileHandler):
     def __init__(self, filename,
                  when='h',
                  interval=1,
@@ -30,6 +33,11 @@ class IconTimeRotatingFileHandler(TimedRotatingFileHandler):
                  atTime=None):
         super().__init__(filename, when, interval, backupCount, encoding, delay, utc, atTime)
 
+        self.index_writer = None
+        self.max_total_bytes = None
+        self.max_age_days = None
+        self.syncer = None
+
     def getFilesToDelete(self):
         """
         Determine the files to delete when rolling over.
@@ -61,9 +69,7 @@ class IconTimeRotatingFileHandler(TimedRotatingFileHandler):
         then we have to get a list of matching filenames, sort them and remove
         the one with the oldest suffix.
         """
-        if self.stream:
-            self.stream.close()
-            self.stream = None
+        close_stream(self)
         # get the time that this sequence started at and make it a TimeTuple
         currentTime = int(time.time())
         dstNow = time.localtime(currentTime)[-1]
@@ -82,13 +88,13 @@ class IconTimeRotatingFileHandler(TimedRotatingFileHandler):
         dfn = self.rotation_filename(self.baseFilename + "." +
                                      time.strftime(rotate_suffix, timeTuple))
         if os.path.exists(dfn):
-            os.remove(dfn)
+            remove_log_file(dfn)
         self.rotate(self.baseFilename, dfn)
-        if self.backupCount > 0:
-            for s in self.getFilesToDelete():
-                os.remove(s)
+        if self.index_writer is not None:
+            self.index_writer.rotate(dfn)
         if not self.delay:
             self.stream = self._open()
+        janitor.submit(self.cleanup)
         newRolloverAt = self.computeRollover(currentTime)
         while newRolloverAt <= currentTime:
             newRolloverAt = newRolloverAt + self.interval
@@ -102,3 +108,13 @@ class IconTimeRotatingFileHandler(TimedRotatingFileHandler):
                     addend = 3600
                 newRolloverAt += addend
         self.rolloverAt = newRolloverAt
+
+    def cleanup(self):
+        """
+        Delete backups beyond backupCount, max_total_bytes and max_age_days.
+        Without backupCount only the budget limits the backups.
+        Called from the janitor thread, out of the handler lock.
+        """
+        if self.backupCount:
+            remove_files(self.getFilesToDelete())
+        remove_files(files_over_budget(self.baseFilename, self.max_total_bytes, self.max_age_days))
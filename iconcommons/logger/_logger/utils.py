@@ -12,8 +12,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import re
+import sys
+import traceback
 
 suffix = "%Y%m%d-%H%M%S"
-extMatch = r"^\d{8}-\d{6}(\.\w+)?$"
+extMatch = r"^\d{8}-\d{6}(\.\d+)?$"
 extMatch = re.compile(extMatch, re.ASCII)
+index_ext = ".idx"
+
+
+def pid_file_path(file_path: str, pid: int) -> str:
+    """
+    './log/iconservice.log' to './log/iconservice.<pid>.log'
+    """
+    root, ext = os.path.splitext(file_path)
+    return f"{root}.{pid}{ext}"
+
+
+def shard_file_path(file_path: str, index: int) -> str:
+    """
+    './log/iconservice.log' to './log/iconservice.shard<index>.log'
+    """
+    root, ext = os.path.splitext(file_path)
+    return f"{root}.shard{index}{ext}"
+
+
+def pid_file_match(file_path: str):
+    """
+    Pattern matching the start of base names pid_file_path() makes out of file_path.
+    """
+    root, ext = os.path.splitext(os.path.basename(file_path))
+    return re.compile(re.escape(root) + r"\.\d+" + re.escape(ext), re.ASCII)
+
+
+def report_error():
+    """
+    Print the exception being handled to stderr, as logging.Handler.handleError() does.
+    Background threads of the handlers call it so that one failure does not stop them.
+    """
+    traceback.print_exc(file=sys.stderr)
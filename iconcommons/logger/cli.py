@@ -0,0 +1,119 @@
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import sys
+import time
+from functools import partial
+
+from ._logger import IconLogReader, write_merged, process_log_paths
+from ._logger.icon_binary_log import IconBinaryDecoder
+from ._logger.icon_log_reader import AsctimeParser, JsonTimeParser
+from ._logger.icon_logger_util import LogConfig
+
+
+def _parse_time(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return time.mktime(time.strptime(value, fmt))
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"Invalid time: {value}")
+
+
+def _query(args):
+    reader = IconLogReader(args.file_path)
+    out = sys.stdout
+    for record in reader.query(args.start, args.end):
+        out.write(record)
+
+
+def _merge(args):
+    if len(args.file_paths) == 1:
+        file_paths = process_log_paths(args.file_paths[0])
+    else:
+        file_paths = args.file_paths
+    parser_factory = AsctimeParser if args.json_field is None else partial(JsonTimeParser, args.json_field)
+
+    if args.output is None:
+        write_merged(file_paths, sys.stdout, start=args.start, end=args.end, parser_factory=parser_factory)
+    else:
+        with open(args.output, 'w') as out:
+            write_merged(file_paths, out, start=args.start, end=args.end, parser_factory=parser_factory)
+
+
+def _decode(args):
+    file_paths = []
+    for file_path in args.file_paths:
+        file_paths.extend(IconLogReader(file_path).files() if args.all else [file_path])
+
+    decoder = IconBinaryDecoder(args.format)
+    out = sys.stdout if args.output is None else open(args.output, 'w')
+    try:
+        for file_path in file_paths:
+            with open(file_path, 'rb') as f:
+                for line in decoder.decode(f):
+                    out.write(line)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def create_parser() -> 'argparse.ArgumentParser':
+    parser = argparse.ArgumentParser(prog='iconlog', description='ICON Commons log tools')
+    sub_parsers = parser.add_subparsers(dest='command')
+    sub_parsers.required = True
+
+    query = sub_parsers.add_parser('query', help='Print records between two times from a log and its backups')
+    query.add_argument('file_path', help='filePath of the log, backups are found next to it')
+    query.add_argument('-s', '--start', type=_parse_time, default=None,
+                       help='"YYYY-mm-dd HH:MM:SS" in local time or epoch seconds')
+    query.add_argument('-e', '--end', type=_parse_time, default=None,
+                       help='"YYYY-mm-dd HH:MM:SS" in local time or epoch seconds')
+    query.set_defaults(func=_query)
+
+    merge = sub_parsers.add_parser('merge', help='Merge per process logs and their backups into one timeline')
+    merge.add_argument('file_paths', nargs='+',
+                       help='logs to merge, a single filePath stands for all of its per process (appendPid) logs')
+    merge.add_argument('-o', '--output', default=None, help='write to a file instead of stdout')
+    merge.add_argument('-s', '--start', type=_parse_time, default=None,
+                       help='"YYYY-mm-dd HH:MM:SS" in local time or epoch seconds')
+    merge.add_argument('-e', '--end', type=_parse_time, default=None,
+                       help='"YYYY-mm-dd HH:MM:SS" in local time or epoch seconds')
+    merge.add_argument('--json-field', default=None,
+                       help='records are JSON lines, take the time from this field')
+    merge.set_defaults(func=_merge)
+
+    decode = sub_parsers.add_parser('decode', help='Print binary logs as text')
+    decode.add_argument('file_paths', nargs='+', help='binary log files')
+    decode.add_argument('-a', '--all', action='store_true', help='also decode the rotated backups, oldest first')
+    decode.add_argument('-f', '--format', default=LogConfig.DEFAULT_FORMAT, help='log.format to write records with')
+    decode.add_argument('-o', '--output', default=None, help='write to a file instead of stdout')
+    decode.set_defaults(func=_decode)
+
+    return parser
+
+
+def main(argv=None):
+    args = create_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except BrokenPipeError:
+        # output piped to head or less
+        sys.stderr.close()
+    return 0
@@ -14,8 +14,10 @@
 
 import os
 import sys
-from logging import DEBUG, INFO, WARNING, ERROR, currentframe
-from ._logger import IconLoggerUtil, icon_logger
+from contextlib import contextmanager
+from typing import Union
+from logging import Logger as builtinLogger, DEBUG, INFO, WARNING, ERROR, currentframe
+from ._logger import IconLoggerUtil, icon_logger, LogContext, log_context
 
 # This code is mainly copied from the python logging module, with minor modifications
 # _srcfile is used when walking the stack to check when we've got the first
@@ -31,44 +33,93 @@ else:
 _srcfile = os.path.normcase(_srcfile)
 
 
+def _disabled(msg: str, tag: str = "LOG"):
+    """
+    Stands in for the Logger level methods of disabled levels.
+    """
+
+
 class Logger(object):
     # for backward compatibility
 
+    # cheap check for hot code which would build an expensive debug message
+    is_debug: bool = True
+
     @classmethod
     def load_config(cls, config: dict):
         IconLoggerUtil.apply_config(icon_logger, config)
 
+    @classmethod
+    def set_level(cls, level: Union[str, int]):
+        IconLoggerUtil.set_level(icon_logger, level.upper() if isinstance(level, str) else level)
+
+    @classmethod
+    def _bind_levels(cls, logger: 'builtinLogger' = icon_logger):
+        """
+        Replace the methods of disabled levels with a no-op and restore the enabled ones,
+        so a disabled call costs neither a classmethod dispatch nor an isEnabledFor().
+        Callers which kept a reference to a method keep the old one.
+
+        A level hook of IconLoggerUtil, so it runs under its config lock after every level change.
+        """
+        if logger is not icon_logger:
+            return
+        for name, level in _levels:
+            method = _level_methods[name] if icon_logger.isEnabledFor(level) else staticmethod(_disabled)
+            setattr(cls, name, method)
+        cls.is_debug = icon_logger.isEnabledFor(DEBUG)
+
     @classmethod
     def print_config(cls, config: dict, tag: str):
         IconLoggerUtil.print_config(icon_logger, config)
 
+    @classmethod
+    @contextmanager
+    def context(cls, **fields):
+        """
+        Bind fields to every record logged in this block, by this thread or asyncio task.
+
+        with Logger.context(block=height, tx=tx_hash):
+            Logger.info("invoke", TAG)  # ... [block=100 tx=0x12] TAG invoke
+
+        Nested blocks add to the fields of the outer one.
+        The prefix is rendered once here, not for each record.
+        Python 3.6 has no contextvars, there the fields are bound per thread only
+        and asyncio tasks of one event loop share them.
+        """
+        token = log_context.set(LogContext(log_context.get(), fields))
+        try:
+            yield
+        finally:
+            log_context.reset(token)
+
     @classmethod
     def debug(cls, msg: str, tag: str = "LOG"):
         if icon_logger.isEnabledFor(DEBUG):
-            cls._log(DEBUG, IconLoggerUtil.make_log_msg(tag, msg))
+            cls._log(DEBUG, IconLoggerUtil.make_log_msg(tag, msg), tag=tag)
 
     @classmethod
     def info(cls, msg: str, tag: str = "LOG"):
         if icon_logger.isEnabledFor(INFO):
-            cls._log(INFO, IconLoggerUtil.make_log_msg(tag, msg))
+            cls._log(INFO, IconLoggerUtil.make_log_msg(tag, msg), tag=tag)
 
     @classmethod
     def warning(cls, msg: str, tag: str = "LOG"):
         if icon_logger.isEnabledFor(WARNING):
-            cls._log(WARNING, IconLoggerUtil.make_log_msg(tag, msg))
+            cls._log(WARNING, IconLoggerUtil.make_log_msg(tag, msg), tag=tag)
 
     @classmethod
     def error(cls, msg: str, tag: str = "LOG"):
         if icon_logger.isEnabledFor(ERROR):
-            cls._log(ERROR, IconLoggerUtil.make_log_msg(tag, msg))
+            cls._log(ERROR, IconLoggerUtil.make_log_msg(tag, msg), tag=tag)
 
     @classmethod
     def exception(cls, msg: str, tag: str = "LOG"):
         if icon_logger.isEnabledFor(ERROR):
-            cls._log(ERROR, IconLoggerUtil.make_log_msg(tag, msg), exc_info=True)
+            cls._log(ERROR, IconLoggerUtil.make_log_msg(tag, msg), exc_info=True, tag=tag)
 
     @classmethod
-    def _log(cls, level, msg, args=None, exc_info=None, extra=None):
+    def _log(cls, level, msg, args=None, exc_info=None, extra=None, tag=None):
         """
         Low-level logging routine which creates a LogRecord and then calls
         all the handlers of this logger to handle the record.
@@ -87,10 +138,32 @@ class Logger(object):
         if exc_info:
             if not isinstance(exc_info, tuple):
                 exc_info = sys.exc_info()
+            deduper = IconLoggerUtil.exception_deduper
+            if deduper is not None and exc_info[0] is not None:
+                msg, exc_info = cls._dedupe_exception(deduper, msg, exc_info)
+        limiter = IconLoggerUtil.message_limiter
+        if limiter is not None:
+            msg = limiter.limit(msg)
+        context = log_context.get()
+        if context is not None:
+            msg = context.prefix + msg
         record = icon_logger.makeRecord(
             icon_logger.name, level, fn, lno, msg, args, exc_info, func, extra)
+        if context is not None:
+            # for formatters which write fields rather than the message
+            record.context = context.fields
+        # binary logs intern the tag instead of writing it in every message
+        record.tag = tag
         icon_logger.handle(record)
 
+    @classmethod
+    def _dedupe_exception(cls, deduper, msg, exc_info):
+        fp, repeats = deduper.check(exc_info)
+        if repeats == 0:
+            return f"{msg} [traceback {fp}]", exc_info
+        # only the exception line, the traceback was written with the first one
+        return f"{msg} [{exc_info[0].__name__}: {exc_info[1]}] [traceback {fp} repeated {repeats}]", None
+
     @classmethod
     def findCaller(cls):
         """
@@ -112,3 +185,8 @@ class Logger(object):
             rv = (co.co_filename, f.f_lineno, co.co_name)
             break
         return rv
+
+
+_levels = (('debug', DEBUG), ('info', INFO), ('warning', WARNING), ('error', ERROR), ('exception', ERROR))
+_level_methods = {name: Logger.__dict__[name] for name, _ in _levels}
+IconLoggerUtil.add_level_hook(Logger._bind_levels)
@@ -23,6 +23,11 @@ setup_options = {
     'packages': find_packages(exclude=['tests*', 'docs']),
     'license': "Apache License 2.0",
     'install_requires': requires,
+    'entry_points': {
+        'console_scripts': [
+            'iconlog=iconcommons.logger.cli:main'
+        ]
+    },
     'setup_requires': ['pytest-runner'],
     'tests_require': ['pytest'],
     'classifiers': [
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Load and soak test of Logger with the rotating file handlers.
+
+Threads of one or more processes log numbered records at a target rate through a 'bytes',
+'period' or 'period|bytes' rotate config with a small maxBytes and a one second period.
+Afterwards every file and backup is read back to find lost, duplicated and broken records,
+and the latency of each Logger call is reported with the throughput.
+
+    $ python tests/stress_logger.py --rotate all --threads 8 --processes 4 --records 20000 --rate 2000
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+
+from iconcommons import Logger
+from iconcommons.logger import IconLogReader, process_log_paths
+from iconcommons.logger._logger import icon_logger
+from iconcommons.logger._logger.icon_log_janitor import janitor
+
+TAG = "stress"
+ROTATE_TYPES = ("bytes", "period", "period|bytes")
+
+record_p = re.compile(r"stress (\d+)-(\d+) (\d+)$")
+
+
+def make_config(file_path: str, rotate_type: str, max_bytes: int, append_pid: bool, extra: dict = None) -> dict:
+    config = {
+        "log": {
+            "logger": "stress",
+            "level": "info",
+            "filePath": file_path,
+            "outputType": "file",
+            "appendPid": append_pid,
+            "rotate": {
+                "type": rotate_type,
+                "period": "secondly",
+                "interval": 1,
+                "maxBytes": max_bytes,
+                # nothing may be deleted, or it would count as lost
+                "backupCount": 1_000_000
+            }
+        }
+    }
+    if extra:
+        config["log"].update(extra)
+    return config
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Nearest rank percentile of sorted values.
+    """
+    if not values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def _log_thread(worker: int, thread: int, records: int, rate: float,
+                barrier: 'threading.Barrier', latencies: List[float]):
+    interval = 1 / rate if rate > 0 else 0.0
+    barrier.wait()
+    next_at = time.perf_counter()
+    for seq in range(records):
+        if interval:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_at += interval
+
+        start = time.perf_counter()
+        Logger.info(f"{worker}-{thread} {seq}", TAG)
+        latencies.append(time.perf_counter() - start)
+
+
+def _close_handlers():
+    for handler in icon_logger.handlers[:]:
+        handler.close()
+        icon_logger.removeHandler(handler)
+    janitor.join()
+
+
+def run_worker(worker: int, config: dict, threads: int, records: int, rate: float) -> tuple:
+    """
+    Log records from threads of this process.
+    Return the latency of every call in seconds, and the wall time logging started and ended at.
+    """
+    Logger.load_config(config)
+
+    barrier = threading.Barrier(threads)
+    latencies = [[] for _ in range(threads)]
+    workers = [threading.Thread(target=_log_thread, args=(worker, i, records, rate, barrier, latencies[i]))
+               for i in range(threads)]
+    started = time.time()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    _close_handlers()
+    ended = time.time()
+
+    return [latency for thread_latencies in latencies for latency in thread_latencies], started, ended
+
+
+def check_files(file_path: str, processes: int, threads: int, records: int) -> dict:
+    """
+    Read back every log and backup, and count the records which are missing, written
+    more than once or which can not be parsed.
+    """
+    seen = Counter()
+    broken = 0
+    files = []
+    for path in process_log_paths(file_path):
+        files.extend(IconLogReader(path).files())
+
+    for path in files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                m = record_p.search(line.rstrip("\n"))
+                if m is None:
+                    broken += 1
+                    continue
+                seen[tuple(map(int, m.groups()))] += 1
+
+    expected = processes * threads * records
+    lost = sum(1 for worker in range(processes) for thread in range(threads) for seq in range(records)
+               if (worker, thread, seq) not in seen)
+    duplicated = sum(count - 1 for count in seen.values() if count > 1)
+    unexpected = sum(1 for worker, thread, seq in seen
+                     if worker >= processes or thread >= threads or seq >= records)
+    return {
+        "expected": expected,
+        "files": len(files),
+        "lost": lost,
+        "duplicated": duplicated,
+        "broken": broken + unexpected,
+    }
+
+
+def run_stress(rotate_type: str,
+               threads: int = 4,
+               processes: int = 1,
+               records: int = 1000,
+               rate: float = 0.0,
+               max_bytes: int = 64 * 1024,
+               log_dir: str = None,
+               extra_config: dict = None) -> dict:
+    """
+    Run one load test and return its report.
+
+    `records` are logged by each thread at `rate` records per second per thread, 0 for as fast as possible.
+    With more than one process every process logs to its own file with 'appendPid'.
+    """
+    remove_dir = log_dir is None
+    log_dir = log_dir or tempfile.mkdtemp(prefix="stress_logger_")
+    file_path = os.path.join(log_dir, "stress.log")
+    config = make_config(file_path, rotate_type, max_bytes, processes > 1, extra_config)
+
+    try:
+        if processes > 1:
+            ctx = multiprocessing.get_context("spawn")
+            with ctx.Pool(processes) as pool:
+                results = pool.starmap(run_worker, [(worker, config, threads, records, rate)
+                                                    for worker in range(processes)])
+        else:
+            results = [run_worker(0, config, threads, records, rate)]
+        # process start up is left out of the throughput
+        elapsed = max(ended for _, _, ended in results) - min(started for _, started, _ in results)
+
+        latencies = sorted(latency for result, _, _ in results for latency in result)
+        report = {
+            "rotate": rotate_type,
+            "threads": threads,
+            "processes": processes,
+            "elapsed": elapsed,
+            "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+            "p50": percentile(latencies, 50),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+        }
+        report.update(check_files(file_path, processes, threads, records))
+        return report
+    finally:
+        if remove_dir:
+            shutil.rmtree(log_dir, ignore_errors=True)
+
+
+def format_report(report: dict) -> str:
+    return (f"rotate={report['rotate']:<13} threads={report['threads']} processes={report['processes']} "
+            f"records={report['expected']} files={report['files']} "
+            f"lost={report['lost']} duplicated={report['duplicated']} broken={report['broken']} "
+            f"throughput={report['throughput']:.0f}/s "
+            f"p50={report['p50'] * 1e6:.1f}us p99={report['p99'] * 1e6:.1f}us max={report['max'] * 1e6:.1f}us")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load and soak test of iconcommons Logger with rotation")
+    parser.add_argument("--rotate", default="all", choices=ROTATE_TYPES + ("all",),
+                        help="rotate type to test (default: all of them)")
+    parser.add_argument("--threads", type=int, default=4, help="logging threads per process")
+    parser.add_argument("--processes", type=int, default=1, help="logging processes")
+    parser.add_argument("--records", type=int, default=10000, help="records per thread")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="records per second per thread, 0 for as fast as possible")
+    parser.add_argument("--max-bytes", type=int, default=64 * 1024, help="rotate maxBytes")
+    parser.add_argument("--durability", help="log.durability policy, e.g. 'interval:100' or 'always'")
+    parser.add_argument("--dir", help="keep the logs in this directory instead of a removed temporary one")
+    args = parser.parse_args(argv)
+
+    rotate_types = ROTATE_TYPES if args.rotate == "all" else (args.rotate,)
+    failed = False
+    for rotate_type in rotate_types:
+        log_dir = None
+        if args.dir:
+            log_dir = os.path.join(args.dir, rotate_type.replace("|", "_"))
+            os.makedirs(log_dir, exist_ok=True)
+        extra_config = {"durability": args.durability} if args.durability else None
+        report = run_stress(rotate_type, args.threads, args.processes, args.records, args.rate,
+                            args.max_bytes, log_dir, extra_config)
+        print(format_report(report))
+        failed |= bool(report["lost"] or report["duplicated"] or report["broken"])
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    exit(main())
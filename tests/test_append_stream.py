@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from functools import partial
+
+from iconcommons.logger._logger.icon_append_stream import IconAppendStream, IOV_MAX
+from iconcommons.logger._logger.icon_logger_util import IconLoggerUtil
+from iconcommons.logger._logger.icon_period_and_bytes_file_handler import IconPeriodAndBytesFileHandler
+from iconcommons.logger._logger.icon_rotating_file_handler import IconRotatingFileHandler
+from iconcommons.logger._logger.icon_time_rotating_file_handler import IconTimeRotatingFileHandler
+
+
+def read_all(dir_name: str) -> list:
+    lines = []
+    for file_name in os.listdir(dir_name):
+        with open(os.path.join(dir_name, file_name), encoding='utf-8') as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+class TestAppendStream(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.dir, "test.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_write(self):
+        stream = IconAppendStream(self.file_path)
+        stream.write("한글 log\n")
+        self.assertEqual(len("한글 log\n".encode()), stream.tell())
+        stream.close()
+
+        stream = IconAppendStream(self.file_path)
+        self.assertEqual(len("한글 log\n".encode()), stream.seek(0, 2))
+        stream.write("second\n")
+        stream.close()
+        with open(self.file_path, encoding='utf-8') as f:
+            self.assertEqual("한글 log\nsecond\n", f.read())
+
+    def test_batch(self):
+        stream = IconAppendStream(self.file_path, batch_records=4, batch_interval=60)
+        for i in range(3):
+            stream.write(f"{i}\n")
+            stream.flush()
+        self.assertEqual(0, os.path.getsize(self.file_path))
+        self.assertEqual(6, stream.tell())
+
+        stream.write("3\n")
+        self.assertEqual(8, os.path.getsize(self.file_path))
+        stream.write("4\n")
+        stream.close()
+        self.assertEqual(10, os.path.getsize(self.file_path))
+
+    def test_batch_over_iov_max(self):
+        count = IOV_MAX * 2 + 1
+        stream = IconAppendStream(self.file_path, batch_records=count, batch_interval=60)
+        for i in range(count):
+            stream.write(f"{i}\n")
+        stream.close()
+        with open(self.file_path) as f:
+            self.assertEqual([str(i) for i in range(count)], f.read().splitlines())
+
+    def test_failed_write_keeps_pending(self):
+        stream = IconAppendStream(self.file_path, batch_records=10, batch_interval=60)
+        for i in range(3):
+            stream.write(f"{i}\n")
+
+        fd = stream._fd
+        stream._fd = os.open(self.file_path, os.O_RDONLY)
+        try:
+            with self.assertRaises(OSError):
+                stream.sync_pending()
+        finally:
+            os.close(stream._fd)
+            stream._fd = fd
+        self.assertEqual(6, stream.tell())
+
+        stream.close()
+        with open(self.file_path) as f:
+            self.assertEqual("0\n1\n2\n", f.read())
+
+    def test_idle_flush(self):
+        stream = IconAppendStream(self.file_path, batch_records=100, batch_interval=0.05)
+        stream.write("0\n")
+        stream.write("1\n")
+        self.assertEqual(0, os.path.getsize(self.file_path))
+
+        # nothing else is logged, the flusher writes them after batch_interval
+        deadline = time.monotonic() + 5
+        while os.path.getsize(self.file_path) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(4, os.path.getsize(self.file_path))
+
+        stream.write("2\n")
+        deadline = time.monotonic() + 5
+        while os.path.getsize(self.file_path) == 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(6, os.path.getsize(self.file_path))
+        stream.close()
+
+    def test_preallocate_keeps_size(self):
+        stream = IconAppendStream(self.file_path, preallocate_bytes=1024 * 1024)
+        stream.write("log\n")
+        stream.close()
+        self.assertEqual(4, os.path.getsize(self.file_path))
+
+    def _check_rotation(self, handler):
+        handler.stream_factory = partial(IconAppendStream, batch_records=8, batch_interval=60)
+        handler.stream.close()
+        handler.stream = handler._open()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        for i in range(1000):
+            handler.emit(logging.LogRecord("test", logging.INFO, __file__, 0, f"record {i}", None, None))
+        handler.close()
+
+        self.assertGreater(len(os.listdir(self.dir)), 1)
+        self.assertEqual(sorted(f"record {i}" for i in range(1000)), sorted(read_all(self.dir)))
+
+    def test_rotating_file_handler(self):
+        self._check_rotation(IconRotatingFileHandler(self.file_path, maxBytes=1024, backupCount=100))
+
+    def test_period_and_bytes_file_handler(self):
+        self._check_rotation(IconPeriodAndBytesFileHandler(self.file_path, maxBytes=1024, backupCount=100))
+
+    def test_time_rotating_file_handler(self):
+        handler = IconTimeRotatingFileHandler(self.file_path, when='S', backupCount=100)
+        count = [0]
+
+        def should_rollover(record):
+            count[0] += 1
+            if count[0] % 100:
+                return False
+            # backups are named after rolloverAt, keep them apart
+            handler.rolloverAt = 1500000000 + count[0]
+            return True
+
+        handler.shouldRollover = should_rollover
+        self._check_rotation(handler)
+
+    def test_config(self):
+        logger = logging.Logger("test")
+        config = {
+            "log": {
+                "filePath": self.file_path,
+                "outputType": "file",
+                "rotate": {"type": "bytes", "maxBytes": 1024, "backupCount": 100},
+                "rawAppend": {"batchRecords": 4}
+            }
+        }
+        IconLoggerUtil.apply_config(logger, config)
+        self.assertIsInstance(logger.handlers[0].stream, IconAppendStream)
+        logger.handlers[0].close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from functools import partial
+
+from iconcommons import Logger
+from iconcommons.logger import IconLogReader, IconBinaryDecoder
+from iconcommons.logger._logger import icon_logger
+from iconcommons.logger._logger.icon_binary_log import IconBinaryStream
+from iconcommons.logger._logger.icon_logger_util import LogConfig
+from iconcommons.logger._logger.icon_rotating_file_handler import IconRotatingFileHandler
+
+TAG = "binary"
+
+
+class CaptureHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestBinaryLog(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.dir, "test.log")
+
+        self.handler = IconRotatingFileHandler(self.file_path, maxBytes=2048, backupCount=100)
+        self.handler.stream_factory = partial(IconBinaryStream, caller=True)
+        self.handler.stream.close()
+        self.handler.stream = self.handler._open()
+        self.capture = CaptureHandler()
+
+        self.level = icon_logger.level
+        self.handlers = icon_logger.handlers[:]
+        icon_logger.handlers = [self.handler, self.capture]
+        Logger.set_level(logging.DEBUG)
+
+    def tearDown(self):
+        icon_logger.handlers = self.handlers
+        Logger.set_level(self.level)
+        self.handler.close()
+        shutil.rmtree(self.dir)
+
+    def decode_all(self) -> list:
+        decoder = IconBinaryDecoder()
+        lines = []
+        for path in IconLogReader(self.file_path).files():
+            with open(path, 'rb') as f:
+                lines.extend(decoder.decode(f))
+        return lines
+
+    def test_round_trip(self):
+        for i in range(200):
+            Logger.info(f"record {i}", TAG)
+            Logger.debug(f"한글 {i}", "other")
+        icon_logger.warning("format %d %s %.2f %r", 1, "two", 3.0, None)
+        icon_logger.error("object %s", {"a": 1})
+        with Logger.context(block=1):
+            Logger.info("in context", TAG)
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            Logger.exception("failed", TAG)
+        self.handler.close()
+
+        formatter = logging.Formatter(LogConfig.DEFAULT_FORMAT)
+        expected = [formatter.format(record) + "\n" for record in self.capture.records]
+        self.assertGreater(len(IconLogReader(self.file_path).files()), 1)
+        self.assertEqual(expected, self.decode_all())
+
+    def test_msecs(self):
+        # msecs of a LogRecord does not always follow from the microseconds of created
+        rand = random.Random(0)
+        stream = IconBinaryStream(os.path.join(self.dir, "msecs.log"))
+        expected = []
+        for _ in range(20000):
+            record = logging.LogRecord("test", logging.INFO, __file__, 0, "msecs", None, None)
+            record.created = 1500000000 + rand.uniform(0, 100000)
+            record.msecs = int((record.created - int(record.created)) * 1000)
+            expected.append(record.msecs)
+            stream.write_record(record)
+        stream.close()
+
+        with open(os.path.join(self.dir, "msecs.log"), 'rb') as f:
+            self.assertEqual(expected, [record.msecs for record in IconBinaryDecoder().records(f)])
+
+    def test_smaller_than_text(self):
+        for i in range(500):
+            icon_logger.info("block %d tx %s", i, "0x1234")
+        self.handler.close()
+
+        formatter = logging.Formatter(LogConfig.DEFAULT_FORMAT)
+        text_size = sum(len(formatter.format(record)) + 1 for record in self.capture.records)
+        binary_size = sum(os.path.getsize(path) for path in IconLogReader(self.file_path).files())
+        self.assertLess(binary_size * 2, text_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
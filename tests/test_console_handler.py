@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import logging
+import re
+import threading
+import time
+import unittest
+
+from iconcommons import Logger
+from iconcommons.logger._logger import icon_logger
+from iconcommons.logger._logger.icon_console_handler import IconConsoleHandler
+
+
+class SlowStream(io.StringIO):
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.release = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.release.wait(self.delay)
+        return super().write(s)
+
+
+def make_record(level: int, i: int) -> 'logging.LogRecord':
+    return logging.LogRecord("test", level, __file__, 0, f"record {i}", None, None)
+
+
+class TestConsoleHandler(unittest.TestCase):
+    def test_write(self):
+        stream = io.StringIO()
+        handler = IconConsoleHandler(stream)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        for i in range(100):
+            handler.handle(make_record(logging.INFO, i))
+        handler.close()
+        self.assertEqual("".join(f"record {i}\n" for i in range(100)), stream.getvalue())
+        self.assertEqual(0, handler.dropped)
+
+    def test_slow_console(self):
+        stream = SlowStream(10)
+        handler = IconConsoleHandler(stream, buffer_size=10)
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+
+        start = time.monotonic()
+        for i in range(1000):
+            handler.handle(make_record(logging.INFO, i))
+        for i in range(5):
+            handler.handle(make_record(logging.ERROR, i))
+        # callers did not wait for the stream
+        self.assertLess(time.monotonic() - start, 5)
+
+        stream.release.set()
+        handler.close()
+
+        lines = stream.getvalue().splitlines()
+        self.assertGreater(handler.dropped, 0)
+        self.assertEqual(1000 + 5, handler.dropped + len([line for line in lines if line.startswith(("INFO", "ERROR"))]))
+        self.assertEqual([f"ERROR record {i}" for i in range(5)], [line for line in lines if line.startswith("ERROR")])
+        # one summary per batch the writer took while records were dropped
+        summaries = [re.fullmatch(r"WARNING console dropped (\d+) records: INFO=(\d+)", line)
+                     for line in lines if line.startswith("WARNING")]
+        self.assertTrue(summaries)
+        self.assertEqual(handler.dropped, sum(int(m.group(1)) for m in summaries))
+
+    def test_config(self):
+        handlers = icon_logger.handlers[:]
+        Logger.load_config({
+            "log": {
+                "level": "info",
+                "outputType": "console",
+                "console": {
+                    "bufferSize": 100,
+                    "keepLevel": "error"
+                }
+            }
+        })
+        try:
+            handler = icon_logger.handlers[0]
+            self.assertIsInstance(handler, IconConsoleHandler)
+            self.assertEqual(100, handler.buffer_size)
+            self.assertEqual(logging.ERROR, handler.keep_level)
+        finally:
+            Logger.load_config({"log": {"outputType": "", "level": "info"}})
+            icon_logger.handlers = handlers
+
+
+if __name__ == '__main__':
+    unittest.main()
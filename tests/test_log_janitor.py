@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from iconcommons import Logger
+from iconcommons.logger._logger import icon_logger
+from iconcommons.logger._logger.icon_log_janitor import janitor, backup_files
+from iconcommons.logger._logger.icon_period_and_bytes_file_handler import IconPeriodAndBytesFileHandler
+from iconcommons.logger._logger.icon_rotating_file_handler import IconRotatingFileHandler
+
+
+def emit_many(handler, count: int):
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for i in range(count):
+        handler.emit(logging.LogRecord("test", logging.INFO, __file__, 0, f"record {i:08d}", None, None))
+
+
+class TestLogJanitor(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.dir, "test.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_backup_count(self):
+        handler = IconRotatingFileHandler(self.file_path, maxBytes=1024, backupCount=3)
+        emit_many(handler, 1000)
+        handler.close()
+        janitor.join()
+        self.assertEqual(3, len(backup_files(self.file_path)))
+
+    def test_max_total_bytes(self):
+        handler = IconPeriodAndBytesFileHandler(self.file_path, maxBytes=1024, backupCount=100)
+        handler.max_total_bytes = 4096
+        emit_many(handler, 1000)
+        handler.close()
+        janitor.join()
+
+        backups = backup_files(self.file_path)
+        self.assertTrue(backups)
+        self.assertLessEqual(sum(os.path.getsize(path) for path in backups), 4096)
+
+    def test_max_age_days(self):
+        old = time.time() - 3 * 24 * 60 * 60
+        for stamp in ("20170101-000000", "20170102-000000"):
+            path = f"{self.file_path}.{stamp}"
+            with open(path, 'w') as f:
+                f.write("old\n")
+            os.utime(path, (old, old))
+
+        handler = IconRotatingFileHandler(self.file_path, maxBytes=1024, backupCount=100)
+        handler.max_age_days = 2
+        emit_many(handler, 100)
+        handler.close()
+        janitor.join()
+
+        backups = backup_files(self.file_path)
+        self.assertTrue(backups)
+        self.assertFalse([path for path in backups if "2017" in path])
+
+    def load_config(self, rotate: dict):
+        Logger.load_config({
+            "log": {
+                "level": "info",
+                "filePath": self.file_path,
+                "outputType": "file",
+                "format": "%(message)s",
+                "rotate": rotate
+            }
+        })
+
+    def log_many(self, count: int):
+        for i in range(count):
+            icon_logger.info(f"record {i:08d}")
+        Logger.load_config({"log": {"outputType": "", "level": "info"}})
+        janitor.join()
+
+    def test_config_max_total_bytes_only(self):
+        self.load_config({"type": "bytes", "maxBytes": 200, "maxTotalBytes": 1000})
+        self.log_many(1000)
+
+        backups = backup_files(self.file_path)
+        self.assertTrue(backups)
+        self.assertLessEqual(sum(os.path.getsize(path) for path in backups), 1000)
+
+    def test_config_max_age_days_only(self):
+        old = time.time() - 3 * 24 * 60 * 60
+        for stamp in ("20170101-000000", "20170102-000000"):
+            path = f"{self.file_path}.{stamp}"
+            with open(path, 'w') as f:
+                f.write("old\n")
+            os.utime(path, (old, old))
+
+        self.load_config({"type": "bytes", "maxBytes": 200, "maxAgeDays": 2})
+        self.log_many(100)
+
+        backups = backup_files(self.file_path)
+        self.assertGreater(len(backups), 5)
+        self.assertFalse([path for path in backups if "2017" in path])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from iconcommons.logger import IconLogReader, merge_logs, process_log_paths
+from iconcommons.logger._logger.icon_log_index import IconLogIndexWriter, read_index
+from iconcommons.logger._logger.icon_logger_util import LogConfig
+from iconcommons.logger._logger.icon_rotating_file_handler import IconRotatingFileHandler
+from iconcommons.logger._logger.utils import pid_file_path
+
+BASE_TIME = 1500000000.0
+
+
+def make_record(i: int) -> 'logging.LogRecord':
+    record = logging.LogRecord("test", logging.INFO, __file__, 0, f"record {i}", None, None)
+    record.created = BASE_TIME + i
+    record.msecs = 0
+    return record
+
+
+class TestLogReader(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.dir, "test.log")
+
+        handler = IconRotatingFileHandler(self.file_path, maxBytes=4096, backupCount=100)
+        handler.setFormatter(logging.Formatter(LogConfig.DEFAULT_FORMAT))
+        handler.index_writer = IconLogIndexWriter(handler.baseFilename, every_records=10)
+        for i in range(1000):
+            handler.emit(make_record(i))
+        handler.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_rotated_with_index(self):
+        reader = IconLogReader(self.file_path)
+        files = reader.files()
+        self.assertGreater(len(files), 10)
+        for path in files:
+            index = read_index(path)
+            self.assertTrue(index)
+            with open(path, 'rb') as f:
+                f.seek(index[0][1])
+                self.assertIn(b"record", f.readline())
+
+    def test_query_range(self):
+        reader = IconLogReader(self.file_path)
+        records = list(reader.query(BASE_TIME + 250, BASE_TIME + 749))
+        self.assertEqual(500, len(records))
+        self.assertTrue(records[0].rstrip().endswith("record 250"))
+        self.assertTrue(records[-1].rstrip().endswith("record 749"))
+
+    def test_query_all(self):
+        reader = IconLogReader(self.file_path)
+        records = list(reader.query())
+        self.assertEqual([str(i) for i in range(1000)], [r.split()[-1] for r in records])
+
+    def test_query_without_index(self):
+        for file_name in os.listdir(self.dir):
+            if file_name.endswith(".idx"):
+                os.remove(os.path.join(self.dir, file_name))
+
+        reader = IconLogReader(self.file_path)
+        records = list(reader.query(BASE_TIME + 990))
+        self.assertEqual(10, len(records))
+
+    def test_query_out_of_order(self):
+        file_path = os.path.join(self.dir, "threads.log")
+        handler = IconRotatingFileHandler(file_path)
+        handler.setFormatter(logging.Formatter(LogConfig.DEFAULT_FORMAT))
+        handler.index_writer = IconLogIndexWriter(handler.baseFilename, every_records=2)
+        for i in (1, 3, 2, 4, 5, 6, 7, 8):
+            handler.emit(make_record(i))
+        handler.close()
+
+        reader = IconLogReader(file_path)
+        records = list(reader.query(BASE_TIME + 1, BASE_TIME + 2.5))
+        self.assertEqual(["1", "2"], [r.split()[-1] for r in records])
+
+        for file_name in os.listdir(self.dir):
+            if file_name.endswith(".idx"):
+                os.remove(os.path.join(self.dir, file_name))
+        records = list(reader.query(None, BASE_TIME + 2.5))
+        self.assertEqual(["1", "2"], [r.split()[-1] for r in records])
+
+
+class TestLogMerge(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.dir, "test.log")
+
+        # three processes writing every third record
+        for pid in range(3):
+            handler = IconRotatingFileHandler(pid_file_path(self.file_path, 100 + pid), maxBytes=2048, backupCount=100)
+            handler.setFormatter(logging.Formatter(LogConfig.DEFAULT_FORMAT))
+            for i in range(pid, 600, 3):
+                handler.emit(make_record(i))
+            handler.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_append_pid(self):
+        config = {"log": {"filePath": "./log/iconservice.log", "appendPid": True}}
+        log_config = LogConfig.from_dict(config)
+        self.assertEqual(f"./log/iconservice.{os.getpid()}.log", log_config.file_path)
+
+    def test_process_log_paths(self):
+        os.remove(pid_file_path(self.file_path, 102))
+        paths = process_log_paths(self.file_path)
+        self.assertEqual([pid_file_path(self.file_path, 100 + pid) for pid in range(3)] + [self.file_path], paths)
+
+    def test_merge(self):
+        records = list(merge_logs(process_log_paths(self.file_path)))
+        self.assertEqual([str(i) for i in range(600)], [r.split()[-1] for r in records])
+
+    def test_merge_range(self):
+        records = list(merge_logs(process_log_paths(self.file_path), BASE_TIME + 100, BASE_TIME + 199))
+        self.assertEqual([str(i) for i in range(100, 200)], [r.split()[-1] for r in records])
+
+
+if __name__ == '__main__':
+    unittest.main()
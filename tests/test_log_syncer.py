@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from iconcommons import Logger
+from iconcommons.logger._logger import icon_log_syncer, icon_logger
+from iconcommons.logger._logger.icon_log_janitor import janitor
+from iconcommons.logger._logger.icon_log_syncer import IconLogSyncer
+from iconcommons.logger._logger.icon_file_handler import IconFileHandler
+from iconcommons.logger._logger.icon_logger_util import DurabilityConfig, IconLoggerUtil
+from iconcommons.logger._logger.icon_rotating_file_handler import IconRotatingFileHandler
+
+
+def make_record(level: int, i: int) -> 'logging.LogRecord':
+    return logging.LogRecord("test", level, __file__, 0, f"record {i:08d}", None, None)
+
+
+class TestLogSyncer(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.dir, "test.log")
+        self.syncs = 0
+
+        fdatasync = icon_log_syncer.fdatasync
+
+        def counting_fdatasync(fd: int):
+            self.syncs += 1
+            # a disk does not sync for free, which is what lets records share one
+            time.sleep(0.001)
+            fdatasync(fd)
+
+        self.patcher = patch.object(icon_log_syncer, 'fdatasync', counting_fdatasync)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        janitor.join()
+        shutil.rmtree(self.dir)
+
+    def make_handler(self, syncer: 'IconLogSyncer', max_bytes: int = 0) -> 'IconRotatingFileHandler':
+        handler = IconRotatingFileHandler(self.file_path, maxBytes=max_bytes, backupCount=100)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.syncer = syncer
+        return handler
+
+    def test_always_grouped(self):
+        syncer = IconLogSyncer('always')
+        handler = self.make_handler(syncer)
+
+        def run(start: int):
+            for i in range(start, start + 100):
+                handler.handle(make_record(logging.INFO, i))
+
+        threads = [threading.Thread(target=run, args=(i * 100,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        syncs = self.syncs
+        syncer.close()
+        handler.close()
+
+        with open(self.file_path) as f:
+            self.assertEqual(800, len(f.readlines()))
+        self.assertGreater(syncs, 0)
+        self.assertLess(syncs, 800)
+
+    def test_on_error(self):
+        syncer = IconLogSyncer('onError')
+        handler = self.make_handler(syncer)
+
+        for i in range(100):
+            handler.handle(make_record(logging.INFO, i))
+        self.assertEqual(0, self.syncs)
+        handler.handle(make_record(logging.ERROR, 100))
+        self.assertEqual(1, self.syncs)
+
+        syncer.close()
+        handler.close()
+
+    def test_interval(self):
+        syncer = IconLogSyncer('interval', 0.05)
+        handler = self.make_handler(syncer)
+
+        for i in range(100):
+            handler.handle(make_record(logging.INFO, i))
+        self.assertEqual(0, self.syncs)
+        deadline = time.monotonic() + 5
+        while self.syncs == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(1, self.syncs)
+
+        syncer.close()
+        handler.close()
+
+    def test_sync_before_rollover(self):
+        syncer = IconLogSyncer('onError')
+        handler = self.make_handler(syncer, max_bytes=1024)
+
+        real_rename = os.rename
+        syncs_at_rename = []
+
+        def rename(src: str, dst: str):
+            syncs_at_rename.append(self.syncs)
+            real_rename(src, dst)
+
+        with patch.object(os, 'rename', rename):
+            for i in range(200):
+                handler.handle(make_record(logging.INFO, i))
+
+        # info records do not wait for a sync, so each one is the sync of a rollover
+        self.assertTrue(syncs_at_rename)
+        self.assertEqual(list(range(1, len(syncs_at_rename) + 1)), syncs_at_rename)
+        syncer.close()
+        handler.close()
+
+    def test_sync_on_reconfigure(self):
+        Logger.load_config({
+            "log": {
+                "level": "info",
+                "filePath": self.file_path,
+                "outputType": "file",
+                "durability": "interval:60000",
+                "rotate": {"type": "bytes", "maxBytes": 1024 * 1024}
+            }
+        })
+        icon_logger.info("waiting for the interval")
+        self.assertEqual(0, self.syncs)
+        Logger.load_config({"log": {"outputType": "", "level": "info"}})
+        self.assertEqual(1, self.syncs)
+
+    def test_file_without_rotate(self):
+        Logger.load_config({
+            "log": {
+                "level": "info",
+                "filePath": self.file_path,
+                "outputType": "file",
+                "durability": "onError"
+            }
+        })
+        try:
+            handler = icon_logger.handlers[0]
+            self.assertIsInstance(handler, IconFileHandler)
+            self.assertIs(IconLoggerUtil.syncer, handler.syncer)
+            icon_logger.info("info")
+            self.assertEqual(0, self.syncs)
+            icon_logger.error("error")
+            self.assertEqual(1, self.syncs)
+        finally:
+            Logger.load_config({"log": {"outputType": "", "level": "info"}})
+
+        with open(self.file_path) as f:
+            self.assertEqual(2, len(f.readlines()))
+
+    def test_config(self):
+        self.assertIsNone(DurabilityConfig.from_dict({}))
+        self.assertIsNone(DurabilityConfig.from_dict({"durability": "none"}))
+        self.assertEqual("always", DurabilityConfig.from_dict({"durability": "always"}).mode)
+        self.assertEqual("onError", DurabilityConfig.from_dict({"durability": "onError"}).mode)
+
+        config = DurabilityConfig.from_dict({"durability": "interval:200"})
+        self.assertEqual("interval", config.mode)
+        self.assertEqual(0.2, config.interval)
+
+        for value in ("interval", "interval:0", "interval:x", "sometimes"):
+            with self.assertRaises(ValueError):
+                DurabilityConfig.from_dict({"durability": value})
+
+
+if __name__ == '__main__':
+    unittest.main()
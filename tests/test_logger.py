@@ -14,10 +14,16 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
+import logging
 import os
+import sys
+import threading
 import unittest
 
 from iconcommons import Logger, IconConfig
+from iconcommons.logger._logger import icon_logger, IconLoggerUtil
+from iconcommons.logger._logger.icon_exception_deduper import IconExceptionDeduper
 
 TAG = 'logger'
 
@@ -94,5 +100,154 @@ class TestLogger(unittest.TestCase):
             Logger.debug(TAG, f'debug log{i}')
 
 
+class CaptureHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestLoggerContext(unittest.TestCase):
+    def setUp(self):
+        self.handler = CaptureHandler()
+        icon_logger.addHandler(self.handler)
+        self.level = icon_logger.level
+        Logger.set_level(logging.INFO)
+
+    def tearDown(self):
+        icon_logger.removeHandler(self.handler)
+        Logger.set_level(self.level)
+
+    def messages(self) -> list:
+        return [record.getMessage() for record in self.handler.records]
+
+    def test_context(self):
+        with Logger.context(block=100, tx="0x12"):
+            Logger.info("outer", TAG)
+            with Logger.context(step=1):
+                Logger.info("inner", TAG)
+        Logger.info("none", TAG)
+
+        self.assertEqual(["[block=100 tx=0x12] logger outer",
+                          "[block=100 tx=0x12 step=1] logger inner",
+                          "logger none"], self.messages())
+        self.assertEqual({"block": 100, "tx": "0x12"}, self.handler.records[0].context)
+        self.assertFalse(hasattr(self.handler.records[2], "context"))
+
+    def test_thread(self):
+        with Logger.context(block=100):
+            thread = threading.Thread(target=Logger.info, args=("thread", TAG))
+            thread.start()
+            thread.join()
+        self.assertEqual(["logger thread"], self.messages())
+
+    @unittest.skipIf(sys.version_info < (3, 7), "python 3.6 binds the context per thread only")
+    def test_asyncio_task(self):
+        async def work(height: int):
+            with Logger.context(block=height):
+                await asyncio.sleep(0)
+                Logger.info("task", TAG)
+
+        async def main():
+            await asyncio.gather(work(1), work(2))
+
+        asyncio.run(main())
+        self.assertEqual(["[block=1] logger task", "[block=2] logger task"], self.messages())
+
+
+class TestExceptionDedupe(unittest.TestCase):
+    def setUp(self):
+        self.handler = CaptureHandler()
+        icon_logger.addHandler(self.handler)
+        self.level = icon_logger.level
+        Logger.set_level(logging.INFO)
+        IconLoggerUtil.exception_deduper = IconExceptionDeduper(window=60)
+
+    def tearDown(self):
+        IconLoggerUtil.exception_deduper = None
+        icon_logger.removeHandler(self.handler)
+        Logger.set_level(self.level)
+
+    @staticmethod
+    def fail(value: int):
+        raise ValueError(value)
+
+    def test_dedupe(self):
+        for i in range(5):
+            try:
+                self.fail(i)
+            except ValueError:
+                Logger.exception("failed", TAG)
+        try:
+            raise KeyError("other")
+        except KeyError:
+            Logger.exception("failed", TAG)
+
+        records = self.handler.records
+        self.assertIsNotNone(records[0].exc_info)
+        fp = records[0].getMessage().split()[-1][:-1]
+        for i, record in enumerate(records[1:5], 1):
+            self.assertIsNone(record.exc_info)
+            self.assertEqual(f"logger failed [ValueError: {i}] [traceback {fp} repeated {i}]", record.getMessage())
+        self.assertIsNotNone(records[5].exc_info)
+        self.assertNotIn(fp, records[5].getMessage())
+
+    def test_window(self):
+        IconLoggerUtil.exception_deduper.window = 0
+        for i in range(3):
+            try:
+                self.fail(i)
+            except ValueError:
+                Logger.exception("failed", TAG)
+        self.assertTrue(all(record.exc_info for record in self.handler.records))
+
+
+class TestLevelBinding(unittest.TestCase):
+    def setUp(self):
+        self.handler = CaptureHandler()
+        icon_logger.addHandler(self.handler)
+        self.level = icon_logger.level
+
+    def tearDown(self):
+        icon_logger.removeHandler(self.handler)
+        Logger.set_level(self.level)
+
+    def test_disabled_levels(self):
+        Logger.set_level("warning")
+        self.assertFalse(Logger.is_debug)
+        Logger.debug("debug", TAG)
+        Logger.info("info", TAG)
+        Logger.warning("warning", TAG)
+        self.assertEqual(["logger warning"], [record.getMessage() for record in self.handler.records])
+        self.assertIsInstance(Logger.__dict__["debug"], staticmethod)
+        self.assertIsInstance(Logger.__dict__["warning"], classmethod)
+
+        Logger.set_level("debug")
+        self.assertTrue(Logger.is_debug)
+        Logger.debug("debug", TAG)
+        self.assertEqual("logger debug", self.handler.records[-1].getMessage())
+        self.assertEqual(TestLevelBinding.__module__, self.handler.records[-1].module)
+
+    def test_load_config(self):
+        Logger.load_config({"log": {"level": "error"}})
+        self.assertFalse(Logger.is_debug)
+        self.assertIsInstance(Logger.__dict__["warning"], staticmethod)
+        self.assertIsInstance(Logger.__dict__["exception"], classmethod)
+        Logger.load_config({"log": {"level": "debug"}})
+        self.assertIsInstance(Logger.__dict__["debug"], classmethod)
+
+    def test_apply_config(self):
+        Logger.load_config({"log": {"level": "warning"}})
+        IconLoggerUtil.apply_config(icon_logger, {"log": {"level": "debug"}})
+        icon_logger.addHandler(self.handler)
+
+        self.assertTrue(Logger.is_debug)
+        Logger.debug("debug", TAG)
+        Logger.info("info", TAG)
+        self.assertEqual(["logger debug", "logger info"], [record.getMessage() for record in self.handler.records])
+
+
 if __name__ == '__main__':
     unittest.main()
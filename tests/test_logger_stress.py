@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+from stress_logger import ROTATE_TYPES, run_stress, percentile
+
+
+class TestLoggerStress(unittest.TestCase):
+    """
+    Short runs of stress_logger.py, run it directly for a soak test.
+    """
+
+    def check(self, report: dict):
+        self.assertEqual(0, report["lost"], report)
+        self.assertEqual(0, report["duplicated"], report)
+        self.assertEqual(0, report["broken"], report)
+        self.assertGreater(report["files"], 1, report)
+
+    def test_threads(self):
+        for rotate_type in ROTATE_TYPES:
+            with self.subTest(rotate=rotate_type):
+                # a period of one second has to pass for 'period' to roll over
+                self.check(run_stress(rotate_type, threads=4, records=600, rate=500, max_bytes=8 * 1024))
+
+    def test_processes(self):
+        self.check(run_stress("period|bytes", threads=2, processes=2, records=1000, max_bytes=8 * 1024))
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(50.0, percentile(values, 50))
+        self.assertEqual(99.0, percentile(values, 99))
+        self.assertEqual(100.0, percentile(values, 100))
+        self.assertEqual(0.0, percentile([], 50))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import unittest
+
+from iconcommons import Logger
+from iconcommons.logger._logger.icon_log_janitor import janitor
+from iconcommons.logger._logger.icon_message_limiter import IconMessageLimiter, truncate_utf8
+from iconcommons.logger._logger.icon_rotating_file_handler import IconRotatingFileHandler
+
+TAG = "limit"
+
+
+class CountingFormatter(logging.Formatter):
+    def __init__(self, fmt: str = None):
+        super().__init__(fmt)
+        self.count = 0
+
+    def format(self, record):
+        self.count += 1
+        return super().format(record)
+
+
+class TestMessageLimiter(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_truncate_utf8(self):
+        self.assertEqual("abc", truncate_utf8("abcdef", 3))
+        # a character is not cut in half
+        self.assertEqual("가", truncate_utf8("가나다", 5))
+        self.assertEqual("가나", truncate_utf8("가나다", 6))
+
+    def test_limit(self):
+        limiter = IconMessageLimiter(100)
+        msg = "a" * 25
+        self.assertIs(msg, limiter.limit(msg))
+        msg = "a" * 100
+        self.assertIs(msg, limiter.limit(msg))
+        msg = "가" * 33
+        self.assertIs(msg, limiter.limit(msg))
+
+        limited = limiter.limit("가" * 34)
+        self.assertEqual("가" * 33 + "... [truncated 34 chars]", limited)
+        limited = limiter.limit("a" * 1000000)
+        self.assertEqual("a" * 100 + "... [truncated 1000000 chars]", limited)
+
+    def test_side_file(self):
+        side_path = os.path.join(self.dir, "oversize.log")
+        limiter = IconMessageLimiter(10, side_path)
+        msg = "block dump " + "x" * 1000
+        limited = limiter.limit(msg)
+        limiter.close()
+
+        m = re.fullmatch(r"block dump\.\.\. \[truncated 1011 chars, full message (\d+-\d+) in (.+)\]", limited)
+        self.assertIsNotNone(m, limited)
+        self.assertEqual(side_path, m.group(2))
+        with open(side_path) as f:
+            header, body = f.read().splitlines()
+        self.assertTrue(header.startswith("=== "))
+        self.assertTrue(header.endswith(f" {m.group(1)} 1011 chars"))
+        self.assertEqual(msg, body)
+
+    def test_pending_bound(self):
+        side_path = os.path.join(self.dir, "oversize.log")
+        limiter = IconMessageLimiter(10, side_path, max_pending_chars=3000)
+        release = threading.Event()
+        write_full = limiter._write_full
+
+        def blocked_write_full(message_id: str, msg: str):
+            release.wait(5)
+            write_full(message_id, msg)
+
+        limiter._write_full = blocked_write_full
+        markers = [limiter.limit("x" * 1000) for _ in range(5)]
+        self.assertEqual(3, len([marker for marker in markers if marker.endswith(f" in {side_path}]")]))
+        self.assertEqual(["x" * 10 + "... [truncated 1000 chars, full message dropped]"] * 2, markers[3:])
+        self.assertEqual(2, limiter.dropped)
+
+        release.set()
+        limiter.close()
+        with open(side_path) as f:
+            self.assertEqual(3, f.read().count("x" * 1000))
+
+    def test_side_file_rotation(self):
+        side_path = os.path.join(self.dir, "oversize.log")
+        limiter = IconMessageLimiter(10, side_path, max_side_bytes=2500)
+        for i in range(10):
+            limiter.limit(str(i) * 1000)
+        limiter.close()
+
+        self.assertEqual(["oversize.log", "oversize.log.1"], sorted(os.listdir(self.dir)))
+        self.assertLessEqual(os.path.getsize(side_path), 2500)
+        self.assertLessEqual(os.path.getsize(side_path + ".1"), 2500 + 1100)
+        with open(side_path) as f:
+            self.assertIn("9" * 1000, f.read())
+
+    def test_logger(self):
+        file_path = os.path.join(self.dir, "test.log")
+        Logger.load_config({
+            "log": {
+                "level": "info",
+                "filePath": file_path,
+                "outputType": "file",
+                "format": "%(message)s",
+                "maxMessageBytes": 20,
+                "rotate": {
+                    "type": "bytes",
+                    "maxBytes": 1024 * 1024,
+                    "backupCount": 10
+                }
+            }
+        })
+        try:
+            Logger.info("short", TAG)
+            Logger.info("y" * 100000, TAG)
+        finally:
+            Logger.load_config({"log": {"outputType": "", "level": "info"}})
+
+        with open(file_path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(["limit short", "limit " + "y" * 14 + "... [truncated 100006 chars]"], lines)
+
+    def test_format_once(self):
+        handler = IconRotatingFileHandler(os.path.join(self.dir, "test.log"), maxBytes=1024, backupCount=100)
+        formatter = CountingFormatter("%(message)s")
+        handler.setFormatter(formatter)
+        for i in range(100):
+            handler.handle(logging.LogRecord("test", logging.INFO, __file__, 0, f"record {i:08d}", None, None))
+        handler.close()
+        janitor.join()
+        self.assertEqual(100, formatter.count)
+
+
+if __name__ == '__main__':
+    unittest.main()
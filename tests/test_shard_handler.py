@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import shutil
+import tempfile
+import unittest
+
+from iconcommons import Logger
+from iconcommons.logger._logger import icon_logger
+from iconcommons.logger._logger.icon_logger_util import LogConfig, RotateType
+from iconcommons.logger._logger.icon_rotating_file_handler import IconRotatingFileHandler
+from iconcommons.logger._logger.icon_shard_handler import IconShardHandler
+
+TAGS = ("p2p", "tx", "block", "score", "rpc", "db")
+
+
+class TestShardHandler(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.dir, "test.log")
+        self.config = {
+            "log": {
+                "level": "info",
+                "filePath": self.file_path,
+                "outputType": "file",
+                "format": "%(message)s",
+                "rotate": {
+                    "type": "bytes",
+                    "maxBytes": 10 * 1024 * 1024,
+                    "backupCount": 10
+                },
+                "shards": {
+                    "count": 3,
+                    "tags": {
+                        "p2p": os.path.join(self.dir, "p2p.log"),
+                        "tx": {
+                            "filePath": os.path.join(self.dir, "fast", "tx.log"),
+                            "rotate": {
+                                "type": "bytes",
+                                "maxBytes": 100,
+                                "backupCount": 100
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+    def tearDown(self):
+        Logger.load_config({"log": {"outputType": "", "level": "info"}})
+        shutil.rmtree(self.dir)
+
+    def read_lines(self, file_name: str) -> list:
+        with open(os.path.join(self.dir, file_name)) as f:
+            return f.read().splitlines()
+
+    def test_route(self):
+        Logger.load_config(self.config)
+        self.assertEqual(1, len(icon_logger.handlers))
+        shards: 'IconShardHandler' = icon_logger.handlers[0]
+        self.assertIsInstance(shards, IconShardHandler)
+        self.assertEqual(3, len(shards.hash_handlers))
+
+        for i in range(50):
+            for tag in TAGS:
+                Logger.info(f"{i}", tag)
+        icon_logger.info("no tag")
+        Logger.load_config({"log": {"outputType": "", "level": "info"}})
+
+        self.assertEqual([f"p2p {i}" for i in range(50)], self.read_lines("p2p.log"))
+        tx_files = [name for name in os.listdir(os.path.join(self.dir, "fast")) if name.startswith("tx.log")]
+        self.assertGreater(len(tx_files), 1)
+        self.assertEqual(["no tag"], self.read_lines("test.log"))
+
+        # every other tag is in one shard file only, with all of its records
+        found = {}
+        for i in range(3):
+            for line in self.read_lines(f"test.shard{i}.log"):
+                tag = line.split()[0]
+                self.assertEqual(i, found.setdefault(tag, i))
+        self.assertEqual(set(TAGS) - {"p2p", "tx"}, set(found))
+        for i in range(3):
+            lines = self.read_lines(f"test.shard{i}.log")
+            for tag in [tag for tag, shard in found.items() if shard == i]:
+                self.assertEqual([f"{tag} {n}" for n in range(50)], [line for line in lines if line.split()[0] == tag])
+
+    def test_route_cached(self):
+        Logger.load_config(self.config)
+        shards: 'IconShardHandler' = icon_logger.handlers[0]
+        self.assertIs(shards.tag_handlers["p2p"], shards.route("p2p"))
+        handler = shards.route("score")
+        self.assertIn(handler, shards.hash_handlers)
+        self.assertIs(handler, shards.route("score"))
+        self.assertIs(shards.default, shards.route(None))
+
+    def test_config(self):
+        self.config["log"]["appendPid"] = True
+        log_config = LogConfig.from_dict(self.config)
+        pid = os.getpid()
+
+        p2p_path, p2p_rotate = log_config.shard_config.tags["p2p"]
+        self.assertEqual(os.path.join(self.dir, f"p2p.{pid}.log"), p2p_path)
+        self.assertIs(log_config.rotate_config, p2p_rotate)
+        _, tx_rotate = log_config.shard_config.tags["tx"]
+        self.assertEqual(RotateType.BYTES, tx_rotate.rotate_type)
+        self.assertEqual(100, tx_rotate.max_bytes)
+        self.assertEqual([os.path.join(self.dir, f"test.{pid}.shard{i}.log") for i in range(3)],
+                         log_config.shard_config.hash_paths)
+
+        del self.config["log"]["shards"]["tags"]["tx"]["filePath"]
+        with self.assertRaises(ValueError):
+            LogConfig.from_dict(self.config)
+
+    def test_no_hash(self):
+        default = IconRotatingFileHandler(self.file_path)
+        shards = IconShardHandler(default, {}, [])
+        self.assertIs(default, shards.route("anything"))
+        shards.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import shutil
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+import unittest
+
+from iconcommons.logger._logger.icon_socket_handler import IconSocketHandler, parse_address
+
+
+class FrameReceiver(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            header = self.rfile.read(4)
+            if len(header) < 4:
+                break
+            (length,) = struct.unpack(">I", header)
+            self.server.received.append(self.rfile.read(length).decode())
+
+
+class CollectorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port: int = 0):
+        super().__init__(("127.0.0.1", port), FrameReceiver)
+        self.received = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def make_record(msg: str) -> 'logging.LogRecord':
+    return logging.LogRecord("test", logging.INFO, __file__, 0, msg, None, None)
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestSocketHandler(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_batched(self):
+        server = CollectorServer()
+        handler = IconSocketHandler(f"tcp://127.0.0.1:{server.server_address[1]}",
+                                    batch_size=16, flush_interval=0.05)
+        for i in range(100):
+            handler.emit(make_record(f"record {i}"))
+        handler.close()
+
+        wait_for(lambda: len(server.received) == 100)
+        server.stop()
+        self.assertEqual([f"record {i}" for i in range(100)], server.received)
+
+    def test_spill_and_replay(self):
+        # reserve a port nobody listens on yet
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+
+        spill_path = os.path.join(self.dir, "spill")
+        handler = IconSocketHandler(f"tcp://127.0.0.1:{port}", batch_size=8, flush_interval=0.05,
+                                    buffer_size=4, spill_path=spill_path, reconnect_interval=0.05)
+        for i in range(50):
+            handler.emit(make_record(f"record {i}"))
+        self.assertGreater(handler._spill_size, 0)
+        self.assertEqual(handler._spill_size, os.path.getsize(spill_path))
+        self.assertEqual(0, handler.dropped)
+
+        server = CollectorServer(port)
+        wait_for(lambda: len(server.received) == 50)
+        handler.close()
+        server.stop()
+
+        self.assertEqual([f"record {i}" for i in range(50)], server.received)
+        self.assertFalse(os.path.exists(spill_path))
+
+    def test_spill_on_close(self):
+        spill_path = os.path.join(self.dir, "spill")
+        handler = IconSocketHandler("tcp://127.0.0.1:1", batch_size=4, flush_interval=0.05,
+                                    buffer_size=4, spill_path=spill_path, reconnect_interval=0.05)
+        for i in range(50):
+            handler.emit(make_record(f"record {i}"))
+            if i == 2:
+                # let the sender take a batch it can not send
+                wait_for(lambda: handler._pending)
+        handler.close()
+
+        records = []
+        with open(spill_path, 'rb') as f:
+            while True:
+                header = f.read(4)
+                if not header:
+                    break
+                (length,) = struct.unpack(">I", header)
+                records.append(f.read(length).decode())
+        self.assertEqual([f"record {i}" for i in range(50)], records)
+
+    def test_drop_without_spill(self):
+        handler = IconSocketHandler("tcp://127.0.0.1:1", buffer_size=4, flush_interval=10)
+        for i in range(10):
+            handler.emit(make_record(f"record {i}"))
+        self.assertEqual(6, handler.dropped)
+        handler.close()
+
+    def test_spill_fd(self):
+        spill_path = os.path.join(self.dir, "spill")
+        handler = IconSocketHandler("tcp://127.0.0.1:1", buffer_size=1, flush_interval=10, spill_path=spill_path)
+        handler.emit(make_record("record 0"))
+        handler.emit(make_record("record 1"))
+        fd = handler._spill_fd
+        self.assertIsNotNone(fd)
+        handler.emit(make_record("record 2"))
+        self.assertEqual(fd, handler._spill_fd)
+        self.assertEqual(handler._spill_size, os.path.getsize(spill_path))
+        handler.close()
+        self.assertIsNone(handler._spill_fd)
+
+    def test_parse_address(self):
+        self.assertEqual((socket.AF_INET, socket.SOCK_STREAM, ("127.0.0.1", 514)),
+                         parse_address("tcp://127.0.0.1:514"))
+        self.assertEqual((socket.AF_INET6, socket.SOCK_DGRAM, ("::1", 514)),
+                         parse_address("udp://[::1]:514"))
+        self.assertEqual((socket.AF_UNIX, socket.SOCK_STREAM, "/tmp/collector.sock"),
+                         parse_address("unix:///tmp/collector.sock"))
+        for address in ("tcp://::1:514", "tcp://127.0.0.1", "http://127.0.0.1:80"):
+            with self.assertRaises(ValueError):
+                parse_address(address)
+
+
+if __name__ == '__main__':
+    unittest.main()